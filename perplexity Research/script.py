@@ -1,103 +1,24 @@
-import csv
-import pandas as pd
+"""
+Build the autonomous-primitives catalog.
 
-# Create the CSV data for autonomous primitives
-csv_data = [
-    ["double-entry", "journal_posting_rule", "Enforce debits equal credits and account-type polarity rules before posting", "Prevents unbalanced entries and maintains accounting equation integrity", "if sum(debits) != sum(credits): reject_transaction(); validate_account_types()", "https://www.investopedia.com/terms/d/double-entry.asp"],
-    
-    ["double-entry", "ledger_engine", "Atomic journal posting with immutable audit trail and period close logic", "Ensures data integrity and provides complete transaction history", "atomic_post(journal_entry); create_audit_trail(timestamp, user, changes)", "https://corporatefinanceinstitute.com/resources/accounting/double-entry/"],
-    
-    ["double-entry", "trial_balance_generator", "Compute and export trial balance, income statement, and balance sheet from ledgers", "Provides real-time financial reporting capabilities", "generate_report(report_type, period); validate_balance_sheet_equation()", "https://www.investopedia.com/terms/d/double-entry.asp"],
-    
-    ["double-entry", "reconciliation_workflows", "Automate bank, accounts receivable, and accounts payable reconciliations with exception handling", "Reduces manual errors and ensures account accuracy", "match_transactions(bank_data, ledger_data); flag_exceptions(unmatched_items)", "https://corporatefinanceinstitute.com/resources/accounting/double-entry/"],
-    
-    ["double-entry", "controls_and_permissions", "Implement segregation of duties, approval chains, and change logs", "Prevents fraud and ensures compliance with internal controls", "check_permissions(user, action); require_approval(transaction_amount, approver_level)", "https://www.investopedia.com/terms/d/double-entry.asp"],
-    
-    ["tps", "pull_signal_orchestration", "Digital kanban system to trigger replenishment based on consumption", "Minimizes inventory while preventing stockouts", "on_consumption(item): if inventory <= reorder_point: trigger_replenishment()", "https://global.toyota/en/company/vision-and-philosophy/production-system/"],
-    
-    ["tps", "jidoka_alarms", "Automated abnormality detection with andon escalation and line stop authority", "Prevents defect propagation and maintains quality standards", "if detect_abnormality(): stop_line(); escalate_andon(severity_level)", "https://global.toyota/en/company/vision-and-philosophy/production-system/"],
-    
-    ["tps", "takt_capacity_balancing", "Real-time takt time computation and heijunka scheduling", "Synchronizes production flow with customer demand", "takt_time = available_time / customer_demand; balance_line(takt_time)", "https://global.toyota/en/company/vision-and-philosophy/production-system/"],
-    
-    ["tps", "standard_work_instructions", "Version-controlled standard operating procedures with adherence tracking", "Ensures consistent work methods and captures deviations", "deliver_sop(station, version); track_adherence(operator, procedure)", "https://global.toyota/en/company/vision-and-philosophy/production-system/"],
-    
-    ["tps", "kaizen_feedback_loop", "Capture improvement ideas with PDCA tracking and effect confirmation", "Drives continuous improvement through employee engagement", "submit_idea(problem, solution); track_pdca_cycle(idea_id); measure_impact()", "https://global.toyota/en/company/vision-and-philosophy/production-system/"],
-    
-    ["pdsa", "experiment_design", "Define hypothesis, success metrics, and plan metadata for each cycle", "Ensures systematic learning and theory testing", "create_hypothesis(theory, prediction); define_metrics(success_criteria)", "https://deming.org/explore/pdsa/"],
-    
-    ["pdsa", "run_execution", "Collect operational and outcome data automatically during do phase", "Captures complete data for analysis without bias", "execute_plan(small_scale=true); collect_data(operational, outcome)", "https://deming.org/explore/pdsa/"],
-    
-    ["pdsa", "study_analytics", "Compare predicted vs observed results with statistical process control", "Enables learning from data and theory validation", "compare_results(predicted, actual); calculate_effect_size(); run_spc_analysis()", "https://deming.org/explore/pdsa/"],
-    
-    ["pdsa", "decision_gates", "Act phase workflows to adopt, abandon, or iterate with change control", "Ensures systematic decision-making based on learning", "if results_validate_theory(): standardize(); else: revise_theory(); iterate()", "https://deming.org/explore/pdsa/"],
-    
-    ["pdsa", "learning_repository", "Link cycles, theories, and outcomes for organizational knowledge management", "Builds institutional memory and prevents repeated mistakes", "store_learning(cycle_id, theory, outcome); link_related_cycles()", "https://deming.org/explore/pdsa/"],
-    
-    ["toc", "constraint_detection", "Throughput analytics to identify system bottleneck resources", "Focuses improvement efforts on the most impactful area", "analyze_throughput(); identify_bottleneck(resource_utilization)", "https://www.leanproduction.com/theory-of-constraints/"],
-    
-    ["toc", "exploitation_scheduler", "Prioritize constraint tasks, minimize setups, and manage buffers", "Maximizes constraint utilization without additional investment", "prioritize_jobs(constraint_capacity); minimize_setups(); manage_buffer_levels()", "https://www.leanproduction.com/theory-of-constraints/"],
-    
-    ["toc", "subordination_rules_engine", "Align non-constraint operations to constraint rhythm", "Prevents overproduction and optimizes system flow", "pace_upstream(constraint_rhythm); ensure_downstream_capacity(constraint_output)", "https://www.leanproduction.com/theory-of-constraints/"],
-    
-    ["toc", "elevation_planner", "Simulate ROI of constraint capacity-adding investments", "Guides capital allocation for maximum throughput improvement", "simulate_investment(option); calculate_throughput_roi(); rank_alternatives()", "https://www.leanproduction.com/theory-of-constraints/"],
-    
-    ["toc", "poogi_cadence", "Recurring improvement cycle with constraint re-evaluation alerts", "Ensures continuous focus on the current constraint", "schedule_review(monthly); re_evaluate_constraint(); alert_if_moved()", "https://www.leanproduction.com/theory-of-constraints/"],
-    
-    ["iso-9001", "document_control", "Version-controlled procedures with approval workflows and distribution tracking", "Ensures all work is based on current, approved documents", "approve_document(version, approver); distribute_controlled_copy(); track_obsolete_versions()", "https://www.iso.org/standard/62085.html"],
-    
-    ["iso-9001", "nonconformity_capa", "Issue intake with root cause analysis and corrective/preventive action tracking", "Prevents recurrence and drives systematic improvement", "log_nonconformity(issue); analyze_root_cause(); implement_capa(action_plan)", "https://www.iso.org/standard/62085.html"],
-    
-    ["iso-9001", "internal_audits", "Scheduled audit programs with findings tracking and follow-up", "Ensures system effectiveness and compliance verification", "schedule_audit(area, frequency); conduct_audit(checklist); track_corrective_actions()", "https://www.iso.org/standard/62085.html"],
-    
-    ["iso-9001", "management_review", "Systematic inputs/outputs capture with action item tracking", "Ensures leadership engagement and system improvement", "collect_inputs(performance_data); conduct_review(); assign_actions(owner, due_date)", "https://www.iso.org/standard/62085.html"],
-    
-    ["iso-9001", "kpi_risk_monitoring", "Process performance monitoring with risk-based thinking integration", "Provides early warning of issues and drives improvement", "monitor_kpis(target_vs_actual); assess_risks(likelihood, impact); trigger_alerts()", "https://www.iso.org/standard/62085.html"],
-    
-    ["lean-six-sigma", "project_charter_workflow", "Define critical-to-quality characteristics, scope, baseline, and team roles", "Ensures projects are focused on customer value and properly resourced", "define_ctqs(customer_requirements); set_scope(boundaries); assign_roles(owner, sponsor)", "https://leansixsigmainstitute.org/the-lean-six-sigma-dmaic-methodology-explained/"],
-    
-    ["lean-six-sigma", "data_pipeline", "Automated data collection, validation, and lineage tracking for measure phase", "Ensures data integrity and traceability for analysis", "collect_data(sources); validate_quality(completeness, accuracy); track_lineage()", "https://leansixsigmainstitute.org/the-lean-six-sigma-dmaic-methodology-explained/"],
-    
-    ["lean-six-sigma", "analysis_toolkit", "Statistical tools including Pareto, fishbone, regression, DOE, and SPC", "Provides robust analytical capabilities for root cause analysis", "run_pareto_analysis(); create_fishbone_diagram(); execute_doe(factors, responses)", "https://leansixsigmainstitute.org/the-lean-six-sigma-dmaic-methodology-explained/"],
-    
-    ["lean-six-sigma", "improvement_sandbox", "A/B testing framework with pilot execution and impact tracking", "Enables safe testing of improvements before full implementation", "design_experiment(control, treatment); measure_impact(kpis); validate_results()", "https://leansixsigmainstitute.org/the-lean-six-sigma-dmaic-methodology-explained/"],
-    
-    ["lean-six-sigma", "control_plan_automation", "Statistical process control with automated alerts and response procedures", "Maintains gains and prevents regression after improvement", "monitor_control_charts(); detect_special_cause(); execute_response_plan()", "https://leansixsigmainstitute.org/the-lean-six-sigma-dmaic-methodology-explained/"],
-    
-    ["balanced-scorecard", "strategy_map_builder", "Visual representation of strategic objectives with cause-and-effect linkages", "Clarifies strategy and shows how objectives connect across perspectives", "create_objectives(perspective, description); link_causality(from_obj, to_obj)", "https://www.hbs.edu/ris/Publication%20Files/10-074_0bf3c151-f82b-4592-b885-cdde7f5d97a6.pdf"],
-    
-    ["balanced-scorecard", "kpi_registry", "Centralized measure definitions with owners, targets, and data sources", "Standardizes measurement and ensures accountability", "define_kpi(name, formula, target); assign_owner(responsible_party); map_data_source()", "https://www.hbs.edu/ris/Publication%20Files/10-074_0bf3c151-f82b-4592-b885-cdde7f5d97a6.pdf"],
-    
-    ["balanced-scorecard", "scorecard_dashboards", "Automated performance reporting with red/amber/green status indicators", "Provides at-a-glance performance visibility for decision-making", "calculate_performance(actual, target); assign_status(red_amber_green); generate_dashboard()", "https://www.hbs.edu/ris/Publication%20Files/10-074_0bf3c151-f82b-4592-b885-cdde7f5d97a6.pdf"],
-    
-    ["balanced-scorecard", "initiative_alignment", "Link strategic projects to objectives with benefit realization tracking", "Ensures investments support strategy and deliver expected returns", "map_initiative(project, objective); track_benefits(planned, actual); calculate_roi()", "https://www.hbs.edu/ris/Publication%20Files/10-074_0bf3c151-f82b-4592-b885-cdde7f5d97a6.pdf"],
-    
-    ["balanced-scorecard", "review_cadence", "Scheduled strategy review meetings with agenda templates and action tracking", "Maintains strategic focus and enables adaptive management", "schedule_review(monthly, quarterly); prepare_agenda(standard_items); track_actions()", "https://www.hbs.edu/ris/Publication%20Files/10-074_0bf3c151-f82b-4592-b885-cdde7f5d97a6.pdf"],
-    
-    ["okr", "okr_editor", "Interface for creating quarterly objectives with 3-5 measurable key results", "Enables clear goal setting with measurable outcomes", "create_objective(description, quarter); add_key_results(measurable_outcomes, max=5)", "https://en.wikipedia.org/wiki/Objectives_and_key_results"],
-    
-    ["okr", "alignment_graph", "Visualization of parent-child and cross-team OKR dependencies", "Shows how individual and team goals support organizational objectives", "map_hierarchy(parent_okr, child_okr); show_dependencies(cross_team_links)", "https://en.wikipedia.org/wiki/Objectives_and_key_results"],
-    
-    ["okr", "progress_engine", "Regular check-in workflows with confidence scoring and automated rollups", "Maintains momentum and provides early warning of at-risk objectives", "conduct_checkin(weekly); score_confidence(0_to_10); rollup_progress(team_to_org)", "https://en.wikipedia.org/wiki/Objectives_and_key_results"],
-    
-    ["okr", "scoring_and_retros", "0-1 or percentage grading system with learning capture", "Enables learning from both success and failure", "calculate_score(achieved/target); conduct_retrospective(what_learned); document_insights()", "https://en.wikipedia.org/wiki/Objectives_and_key_results"],
-    
-    ["okr", "transparency_controls", "Default public visibility with permissions for sensitive objectives", "Promotes alignment and accountability while protecting confidential information", "set_visibility(default_public); apply_permissions(sensitive_okrs); enable_comments()", "https://en.wikipedia.org/wiki/Objectives_and_key_results"],
-    
-    ["itil", "incident_problem_modules", "Purpose-driven workflows with SLA timers and knowledge base integration", "Ensures rapid restoration of service with learning capture", "log_incident(description, priority); start_sla_timer(); link_knowledge(solutions)", "https://itsm.tools/the-itil-4-service-value-system-explained/"],
-    
-    ["itil", "service_catalog_slm", "Centralized service definitions with SLA/XLA monitoring and attainment tracking", "Clarifies service expectations and measures provider performance", "define_service(catalog_entry, sla_terms); monitor_performance(actual_vs_sla)", "https://itsm.tools/the-itil-4-service-value-system-explained/"],
-    
-    ["itil", "change_enablement", "Risk assessment workflows with Change Advisory Board and scheduling", "Balances change velocity with stability and risk management", "assess_risk(change_impact, probability); schedule_cab(review_changes); approve_change()", "https://itsm.tools/the-itil-4-service-value-system-explained/"],
-    
-    ["itil", "cmdb_config_management", "Configuration item records with relationship mapping and impact analysis", "Provides understanding of service dependencies for change and incident management", "maintain_ci_records(assets, relationships); perform_impact_analysis(change_scope)", "https://itsm.tools/the-itil-4-service-value-system-explained/"],
-    
-    ["itil", "continual_improvement_register", "Opportunity intake with prioritization based on guiding principles", "Ensures systematic improvement aligned with organizational values", "log_opportunity(improvement_idea); prioritize(value, effort); assign_owner()", "https://itsm.tools/the-itil-4-service-value-system-explained/"],
-]
+The primitive list that used to live here is now in data/primitives/, one CSV
+per system, and scripts/build_catalog.py streams it into
+data/autonomous-primitives.csv plus a lookup index. This wrapper just runs
+that build; extra arguments go to the build command, e.g. --preview 3
+(the only option that imports pandas) or --force.
+"""
 
-# Create DataFrame and save to CSV
-df = pd.DataFrame(csv_data, columns=["system", "primitive", "description", "why_it_matters", "example_logic", "source_url"])
-df.to_csv("autonomous-primitives.csv", index=False)
+import pathlib
+import sys
 
-print(f"Created CSV with {len(csv_data)} automation primitives")
-print("\nFirst few rows:")
-print(df.head(3).to_string())
\ No newline at end of file
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+
+import build_catalog
+
+sys.exit(build_catalog.main([
+    "--src", str(ROOT / build_catalog.SOURCES),
+    "--out", str(ROOT / build_catalog.CATALOG),
+    "--index", str(ROOT / build_catalog.INDEX),
+    "build", *sys.argv[1:],
+]))
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Build data/autonomous-primitives.csv from per-system source files.
+
+Primitive definitions live in data/primitives/<system>.csv (one file per
+business system, catalog order in systems.txt). The catalog is streamed row
+by row through csv.writer, and a JSON index records the byte range of every
+system and primitive so other scripts can fetch rows with a seek instead of
+loading the whole CSV. The index also stores a digest of the inputs; when it
+still matches, the build is skipped.
+
+pandas is only imported for --preview.
+
+Usage:
+  build_catalog.py build [--force] [--preview N]
+  build_catalog.py get --system tps
+  build_catalog.py get --primitive jidoka_alarms
+"""
+
+import argparse
+import csv
+import hashlib
+import io
+import json
+import os
+import pathlib
+import sys
+
+SOURCES = pathlib.Path("data/primitives")
+CATALOG = pathlib.Path("data/autonomous-primitives.csv")
+INDEX = pathlib.Path("data/autonomous-primitives.index.json")
+ORDER_FILE = "systems.txt"
+COLUMNS = ["system", "primitive", "description", "why_it_matters", "example_logic", "source_url"]
+# Bump when the CSV layout or index format changes
+BUILDER_VERSION = 1
+
+def source_files(src=SOURCES):
+    """Source CSVs in catalog order: systems.txt first, then the rest by name"""
+    src = pathlib.Path(src)
+    available = {p.stem: p for p in src.glob("*.csv")}
+    order = []
+    order_path = src / ORDER_FILE
+    if order_path.exists():
+        for line in order_path.read_text().splitlines():
+            name = line.strip()
+            if name and not name.startswith("#") and name in available and name not in order:
+                order.append(name)
+    order += sorted(name for name in available if name not in order)
+    return [available[name] for name in order]
+
+def inputs_digest(files):
+    h = hashlib.sha256(f"v{BUILDER_VERSION}\n".encode())
+    for path in files:
+        h.update(f"{path.name}\n".encode())
+        h.update(hashlib.sha256(path.read_bytes()).digest())
+    return h.hexdigest()
+
+def iter_rows(files):
+    """Yield catalog rows, prefixing each source row with its system name"""
+    for path in files:
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header != COLUMNS[1:]:
+                raise ValueError(f"{path}: expected columns {','.join(COLUMNS[1:])}")
+            for line_no, row in enumerate(reader, start=2):
+                if not any(row):
+                    continue
+                if len(row) != len(COLUMNS) - 1:
+                    raise ValueError(f"{path}:{line_no}: expected {len(COLUMNS) - 1} fields, got {len(row)}")
+                yield [path.stem] + row
+
+def load_index(index_path=INDEX):
+    try:
+        with open(index_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def is_current(index, digest, out):
+    """Index matches the inputs and the catalog it describes is still on disk"""
+    out = pathlib.Path(out)
+    return (index is not None and index.get("version") == BUILDER_VERSION
+            and index.get("inputs") == digest
+            and out.exists() and out.stat().st_size == index.get("size"))
+
+def build(src=SOURCES, out=CATALOG, index_path=INDEX, force=False):
+    """Write the catalog and its index; returns (index, built)"""
+    out, index_path = pathlib.Path(out), pathlib.Path(index_path)
+    files = source_files(src)
+    digest = inputs_digest(files)
+    index = load_index(index_path)
+    if not force and is_current(index, digest, out):
+        return index, False
+
+    systems, primitives = {}, {}
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(out.name + ".tmp")
+    offset = 0
+    with open(tmp, "wb") as f:
+        def write_row(row):
+            nonlocal offset
+            writer.writerow(row)
+            data = buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+            f.write(data)
+            start, offset = offset, offset + len(data)
+            return start, len(data)
+
+        write_row(COLUMNS)
+        for row in iter_rows(files):
+            system, primitive = row[0], row[1]
+            start, length = write_row(row)
+            if primitive in primitives:
+                raise ValueError(f"duplicate primitive {primitive!r} in {system} and {primitives[primitive][2]}")
+            primitives[primitive] = [start, length, system]
+            span = systems.setdefault(system, [start, start, 0])
+            span[1] = start + length
+            span[2] += 1
+    os.replace(tmp, out)
+
+    index = {
+        "version": BUILDER_VERSION,
+        "inputs": digest,
+        "catalog": out.name,
+        "size": offset,
+        "rows": len(primitives),
+        "columns": COLUMNS,
+        # system -> [start, end, rows]; primitive -> [offset, length, system]
+        "systems": systems,
+        "primitives": primitives,
+    }
+    tmp = index_path.with_name(index_path.name + ".tmp")
+    tmp.write_text(json.dumps(index, indent=1) + "\n")
+    os.replace(tmp, index_path)
+    return index, True
+
+def _read_range(catalog, start, end):
+    with open(catalog, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start).decode("utf-8")
+    return [dict(zip(COLUMNS, row)) for row in csv.reader(io.StringIO(data, newline=""))]
+
+def lookup(system=None, primitive=None, catalog=CATALOG, index_path=INDEX):
+    """Rows for one system or one primitive, read by seeking into the catalog"""
+    index = load_index(index_path)
+    if index is None:
+        raise FileNotFoundError(f"{index_path} missing; run build_catalog.py build")
+    if primitive is not None:
+        hit = index["primitives"].get(primitive)
+        return _read_range(catalog, hit[0], hit[0] + hit[1]) if hit else []
+    hit = index["systems"].get(system)
+    return _read_range(catalog, hit[0], hit[1]) if hit else []
+
+def preview(catalog, rows):
+    try:
+        import pandas as pd
+    except ImportError:
+        print("(pandas not installed; showing raw rows)")
+        with open(catalog, newline="", encoding="utf-8") as f:
+            for i, row in enumerate(csv.reader(f)):
+                if i > rows:
+                    break
+                print(" | ".join(row))
+        return
+    print(pd.read_csv(catalog, nrows=rows).to_string())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and query the autonomous-primitives catalog")
+    parser.add_argument("--src", type=pathlib.Path, default=SOURCES)
+    parser.add_argument("--out", type=pathlib.Path, default=CATALOG)
+    parser.add_argument("--index", type=pathlib.Path, default=INDEX)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_build = sub.add_parser("build", help="regenerate the catalog if its inputs changed")
+    p_build.add_argument("--force", action="store_true", help="rebuild even if inputs are unchanged")
+    p_build.add_argument("--preview", type=int, metavar="N", help="print the first N rows")
+    p_get = sub.add_parser("get", help="print rows from the index without reading the whole catalog")
+    which = p_get.add_mutually_exclusive_group(required=True)
+    which.add_argument("--system")
+    which.add_argument("--primitive")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "build":
+        try:
+            index, built = build(args.src, args.out, args.index, args.force)
+        except ValueError as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            return 1
+        state = "built" if built else "unchanged, skipped"
+        print(f"{args.out}: {index['rows']} primitives across {len(index['systems'])} systems ({state})")
+        if args.preview:
+            preview(args.out, args.preview)
+        return 0
+
+    rows = lookup(args.system, args.primitive, args.out, args.index)
+    if not rows:
+        print(f"not found: {args.system or args.primitive}", file=sys.stderr)
+        return 1
+    for row in rows:
+        print(json.dumps(row))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,14 +14,23 @@ fi
 start=$(date +%s)
 deadline=$((start+20*60))
 
-python3 scripts/triage.py front-desk/intake.md front-desk/triage.md front-desk/log.jsonl
+python3 scripts/triage.py front-desk/intake.md front-desk/triage front-desk/log.jsonl
+ACTIVE_SHARD=$(python3 scripts/triage_shards.py active)
 python3 scripts/verify_log.py front-desk/log.jsonl   # stop if chain broken
 echo "[front-desk] log verified"
+python3 scripts/ticket_state.py snapshot
+
+# Ship only the new log bytes to each mirror (space-separated dirs)
+if [ -n "${FRONT_DESK_MIRRORS:-}" ]; then
+    # shellcheck disable=SC2086
+    python3 scripts/mirror_log.py $FRONT_DESK_MIRRORS
+fi
 
 # Git integrity and snapshot
 if command -v git &> /dev/null && [ -d .git ]; then
     echo "[front-desk] creating git snapshot..."
-    git add front-desk/log.jsonl front-desk/triage.md
+    # the whole directory, so hand edits to closed months are snapshotted too
+    git add front-desk/log.jsonl front-desk/triage/
     git commit -m "front-desk: daily snapshot $(date -u +%Y-%m-%d)" || true
 fi
 
@@ -43,7 +52,7 @@ $(./scripts/marriage_protection.sh status 2>/dev/null || echo "Marriage protecti
 - Tasks triaged: $(tail -10 front-desk/log.jsonl | grep -c "triage" || echo "0")
 
 ## Triage Queue Status
-$(tail -5 front-desk/triage.md | grep "| T-" | wc -l) open items in triage queue
+$( (tail -5 "$ACTIVE_SHARD" 2>/dev/null || true) | grep "| T-" | wc -l) open items in triage queue
 
 ## Next Actions
 - Review marriage protection limits before continuing work
@@ -58,10 +67,13 @@ EOF
 if [ "$(date +%u)" = "7" ]; then
     echo "[daily-loop] Sunday detected, generating weekly report..."
     WEEK=$(date +%Y-W%V)
-    python3 scripts/make_weekly_report.py > "reports/weekly/$WEEK.md"
+    python3 scripts/make_weekly_report.py "reports/weekly/$WEEK.md"
     echo "✅ Weekly report generated: reports/weekly/$WEEK.md"
 fi
 
+# Refresh textfile metrics (no-op unless FRONT_DESK_METRICS_DIR is set)
+python3 scripts/front_desk_metrics.py front-desk
+
 now=$(date +%s); left=$((deadline-now))
 [ $left -lt 0 ] && left=0
 echo "Close-out: choose ONE item to do now (<= $left sec)."
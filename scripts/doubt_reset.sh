@@ -35,12 +35,9 @@ echo ""
 
 # STEP 4: Triage the doubt immediately
 echo -e "${BLUE}STEP 4: TRIAGING THE DOUBT${NC}"
-# Get next note_id
-LAST_ID=$(grep -o '"note_id":[0-9]*' front-desk/log.jsonl 2>/dev/null | tail -1 | cut -d: -f2 || echo 0)
-NEXT_ID=$((LAST_ID + 1))
-DATE_TODAY=$(date -u +%Y-%m-%d)
-
-echo "$DATE_TODAY | note_id=$NEXT_ID | action: pushed-through-doubt | due: 1h | priority: urgent" >> front-desk/triage.md
+# note_id is assigned under the log lock, so a concurrent triage session can't reuse it
+NEXT_ID=$(python3 scripts/triage_interactive.py --add "Doubt hit at $DOUBT_TIME - continuing anyway" \
+    --action pushed-through-doubt --due 1h --priority urgent)
 echo -e "${GREEN}✓ Triaged doubt as urgent action${NC}"
 echo ""
 
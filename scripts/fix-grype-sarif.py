@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Fix empty artifact locations in Grype SARIF output for GitHub Code Scanning.
+
+Grype scans of an SBOM leave artifactLocation.uri empty, which Code Scanning
+rejects. When an SPDX SBOM is given, each result is resolved to the manifest
+that declared the vulnerable package (e.g. pnpm-lock.yaml). The SBOM is read
+once into a compact package -> location index, cached on disk under a
+SHA-256 of its content minus the per-run header fields (syft writes a fresh
+documentNamespace and creationInfo every time), so a later run against a
+regenerated but otherwise identical SBOM skips parsing it.
+Results that cannot be resolved fall back to a dependency-scan/ prefix.
+
+Usage:
+  fix-grype-sarif.py input.sarif output.sarif [--sbom sbom.spdx.json] [--cache-dir DIR]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+
+DEFAULT_CACHE_DIR = os.environ.get('SBOM_INDEX_CACHE', '.cache/sbom-index')
+INDEX_VERSION = 1
+CHUNK = 1 << 16
+
+PACKAGES_KEY = re.compile(r'"packages"\s*:\s*\[')
+# per-run fields of the SPDX document header; they change on every syft run
+RUN_FIELDS = re.compile(rb'"documentNamespace"\s*:\s*"[^"]*"\s*,?|"creationInfo"\s*:\s*\{[^{}]*\}\s*,?')
+PACKAGES_KEY_BYTES = re.compile(PACKAGES_KEY.pattern.encode())
+SOURCE_FILE = re.compile(r'file:\s*(\S+)')
+# Grype: "A high vulnerability in npm package: minimist, version 1.2.5 was found at: ..."
+RESULT_PACKAGE = re.compile(r'package:\s*(?P<name>[^,\s]+),\s*version\s+(?P<version>\S+)')
+
+
+def content_digest(path):
+    """SHA-256 of an SBOM without its documentNamespace and creationInfo.
+
+    Both sit in the document header ahead of "packages" (syft writes them
+    there, and they sort before it), so only the header is buffered; the
+    rest is hashed in chunks as read.
+    """
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        head = b''
+        while not PACKAGES_KEY_BYTES.search(head):
+            chunk = f.read(CHUNK)
+            if not chunk:
+                break
+            head += chunk
+        h.update(RUN_FIELDS.sub(b'', head))
+        for chunk in iter(lambda: f.read(CHUNK), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def iter_spdx_packages(path):
+    """Yield the objects of the SPDX "packages" array one at a time.
+
+    The document is read in chunks and each package is decoded on its own,
+    so the multi-megabyte SBOM is never held as one parsed tree.
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, eof, started = '', 0, False, False
+    with open(path, 'r', encoding='utf-8') as f:
+        while True:
+            if not started:
+                m = PACKAGES_KEY.search(buf)
+                if m:
+                    buf, pos, started = buf[m.end():], 0, True
+                    continue
+                if eof:
+                    return
+                # keep a tail in case the key spans two chunks
+                buf = buf[-32:]
+            else:
+                while pos < len(buf) and buf[pos] in ' \t\r\n,':
+                    pos += 1
+                if pos < len(buf):
+                    if buf[pos] == ']':
+                        return
+                    try:
+                        obj, end = decoder.raw_decode(buf, pos)
+                    except json.JSONDecodeError:
+                        if eof:
+                            raise
+                    else:
+                        yield obj
+                        pos = end
+                        continue
+                elif eof:
+                    return
+                buf, pos = buf[pos:], 0
+            chunk = f.read(CHUNK)
+            eof = not chunk
+            buf += chunk
+
+
+def package_location(package):
+    """Manifest path recorded by syft in sourceInfo, relative to the repo root."""
+    m = SOURCE_FILE.search(package.get('sourceInfo', ''))
+    return m.group(1).lstrip('/') if m else None
+
+
+def build_index(sbom_path):
+    """Map "name@version" and bare "name" to the declaring manifest."""
+    index = {}
+    for package in iter_spdx_packages(sbom_path):
+        location = package_location(package)
+        name = package.get('name')
+        if not location or not name:
+            continue
+        index[f"{name}@{package.get('versionInfo', '')}"] = location
+        index.setdefault(name, location)
+    return index
+
+
+def load_index(sbom_path, cache_dir=DEFAULT_CACHE_DIR):
+    """Return the package index for an SBOM, building and caching it on a miss."""
+    cache_path = os.path.join(cache_dir, f'{content_digest(sbom_path)}.json')
+    try:
+        with open(cache_path, 'r') as f:
+            cached = json.load(f)
+        if cached.get('version') == INDEX_VERSION:
+            return cached['index'], True
+    except (OSError, ValueError, KeyError):
+        pass
+
+    index = build_index(sbom_path)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = cache_path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump({'version': INDEX_VERSION, 'index': index}, f, separators=(',', ':'))
+    os.replace(tmp, cache_path)
+    return index, False
+
+
+def resolve_uri(result, index):
+    """Manifest path for a result, or a dependency-scan/ placeholder."""
+    m = RESULT_PACKAGE.search(result.get('message', {}).get('text', ''))
+    if m:
+        name, version = m.group('name'), m.group('version')
+        location = index.get(f'{name}@{version}') or index.get(name)
+        if location:
+            return location
+        return f'dependency-scan/{name}'
+    return f"dependency-scan/{result.get('ruleId') or 'unknown'}"
+
+
+def fix_sarif(sarif, index):
+    """Fill empty artifact locations in place. Returns (fixed, resolved) counts."""
+    fixed = resolved = 0
+    for run in sarif.get('runs', []):
+        for result in run.get('results', []):
+            for location in result.get('locations', []):
+                physical_loc = location.setdefault('physicalLocation', {})
+                artifact_loc = physical_loc.setdefault('artifactLocation', {})
+                if artifact_loc.get('uri', '').strip():
+                    continue
+                uri = resolve_uri(result, index)
+                artifact_loc['uri'] = uri
+                fixed += 1
+                if not uri.startswith('dependency-scan/'):
+                    resolved += 1
+    return fixed, resolved
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Fix empty artifact locations in Grype SARIF')
+    parser.add_argument('input')
+    parser.add_argument('output')
+    parser.add_argument('--sbom', help='SPDX JSON SBOM the scan was run against')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    args = parser.parse_args(argv)
+
+    try:
+        with open(args.input, 'r') as f:
+            sarif = json.load(f)
+
+        index = {}
+        if args.sbom and os.path.exists(args.sbom):
+            index, hit = load_index(args.sbom, args.cache_dir)
+            print(f"SBOM index: {len(index)} keys ({'cached' if hit else 'built'})")
+
+        fixed, resolved = fix_sarif(sarif, index)
+
+        with open(args.output, 'w') as f:
+            json.dump(sarif, f, indent=2)
+
+        print(f'Fixed {fixed} SARIF artifact locations ({resolved} resolved from SBOM)')
+    except Exception as e:
+        print(f'Error processing SARIF file: {e}', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Prometheus textfile metrics for the front desk scripts.
+
+Each script writes its own front_desk_<job>.prom file into the directory
+named by FRONT_DESK_METRICS_DIR (point node_exporter's
+--collector.textfile.directory at it). Files are written to a temp name and
+renamed, so the collector never reads a partial file. When the variable is
+unset every call is a no-op.
+
+Every metric's type and HELP text is declared once in METRICS, and scripts
+report through the record_* helpers, so two files can never disagree on a
+HELP string (node_exporter rejects that). Counters are kept in their job's
+own file and added to under a lock, so they survive across runs.
+
+Run directly to refresh the gauges that are cheap to compute from the tree:
+intake backlog size and log size per segment.
+"""
+
+import fcntl
+import os
+import pathlib
+import re
+import sys
+import time
+
+METRICS_DIR_ENV = "FRONT_DESK_METRICS_DIR"
+
+METRICS = {
+    "front_desk_last_run_timestamp_seconds": ("gauge", "Unix time the job last wrote its metrics."),
+    "front_desk_entries_appended_total": ("counter", "Log entries appended by triage runs."),
+    "front_desk_report_generation_seconds": ("gauge", "Wall time of the last report generation."),
+    "front_desk_report_skipped": ("gauge", "1 if the last run reused an unchanged report."),
+    "front_desk_verify_duration_seconds": ("gauge", "Wall time of the last chain verification."),
+    "front_desk_verify_bytes_scanned": ("gauge", "Log bytes read by the last chain verification."),
+    "front_desk_verify_ok": ("gauge", "1 if the last chain verification passed."),
+    "front_desk_intake_backlog": ("gauge", "Unchecked items waiting in intake.md."),
+    "front_desk_log_segment_bytes": ("gauge", "Size of each log segment in bytes."),
+    "front_desk_load_events_per_second": ("gauge", "Throughput of the last load run."),
+    "front_desk_load_append_seconds": ("gauge", "Append latency percentile of the last load run."),
+}
+
+def metrics_dir():
+    path = os.environ.get(METRICS_DIR_ENV)
+    return pathlib.Path(path) if path else None
+
+def _labels(labels):
+    if not labels:
+        return ""
+    parts = []
+    for k, v in sorted(labels.items()):
+        v = str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{k}="{v}"')
+    return "{" + ",".join(parts) + "}"
+
+def render(samples):
+    """Render (name, value, labels) tuples in text exposition format"""
+    lines, seen = [], set()
+    for name, value, labels in samples:
+        if name not in seen:
+            kind, help_text = METRICS[name]
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            seen.add(name)
+        lines.append(f"{name}{_labels(labels)} {value}")
+    return "\n".join(lines) + "\n"
+
+def emit(job, samples):
+    """Atomically write samples to front_desk_<job>.prom; no-op if unconfigured"""
+    out_dir = metrics_dir()
+    if out_dir is None:
+        return None
+    out_dir.mkdir(parents=True, exist_ok=True)
+    samples = list(samples) + [
+        ("front_desk_last_run_timestamp_seconds", int(time.time()), {"job": job}),
+    ]
+    target = out_dir / f"front_desk_{job}.prom"
+    tmp = out_dir / f".front_desk_{job}.prom.{os.getpid()}.tmp"
+    tmp.write_text(render(samples))
+    os.replace(tmp, target)
+    return target
+
+def _read_value(path, name, labels):
+    prefix = f"{name}{_labels(labels)} "
+    try:
+        with open(path) as f:
+            for line in f:
+                if line.startswith(prefix):
+                    return float(line[len(prefix):])
+    except (OSError, ValueError):
+        pass
+    return 0
+
+def add_to_counter(job, name, amount, labels):
+    """Add amount to a counter stored in front_desk_<job>.prom; no-op if unconfigured"""
+    out_dir = metrics_dir()
+    if out_dir is None:
+        return None
+    out_dir.mkdir(parents=True, exist_ok=True)
+    with open(out_dir / f".front_desk_{job}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        total = _read_value(out_dir / f"front_desk_{job}.prom", name, labels) + amount
+        return emit(job, [(name, int(total) if total == int(total) else total, labels)])
+
+def record_appended(src, count):
+    """Count log entries appended by a triage writer (src: intake, interactive, ...)"""
+    return add_to_counter(f"triage_{src}", "front_desk_entries_appended_total", count, {"src": src})
+
+def record_report(job, report_file, started, skipped):
+    # job keeps generators that write the same report file (week-01.md) apart
+    labels = {"job": job, "report": os.path.basename(report_file)}
+    return emit(job, [
+        ("front_desk_report_generation_seconds", round(time.monotonic() - started, 6), labels),
+        ("front_desk_report_skipped", int(skipped), labels),
+    ])
+
+def record_verify(path, mode, started, status, stats):
+    """stats: start_offset where the scan began, prefix_bytes hashed to get there (fsck --fast)"""
+    size = os.path.getsize(path) if os.path.exists(path) else 0
+    labels = {"mode": mode}
+    return emit(f"verify_{mode}", [
+        ("front_desk_verify_duration_seconds", round(time.monotonic() - started, 6), labels),
+        ("front_desk_verify_bytes_scanned", stats.get("prefix_bytes", 0) + size - stats.get("start_offset", 0), labels),
+        ("front_desk_verify_ok", int(status == 0), labels),
+    ])
+
+def record_load(events_per_second, latencies):
+    """Throughput and (writer, p50 ms, p99 ms) rows from load_front_desk.py
+
+    Percentiles are gauge labels rather than "quantile", which is reserved
+    for summaries.
+    """
+    samples = [("front_desk_load_events_per_second", round(events_per_second, 3), {})]
+    for writer, p50, p99 in latencies:
+        for pct, ms in (("p50", p50), ("p99", p99)):
+            samples.append(("front_desk_load_append_seconds", round(ms / 1000, 6),
+                            {"writer": writer, "percentile": pct}))
+    return emit("load", samples)
+
+def intake_backlog(intake_path):
+    """Unchecked '- [ ]' bullets waiting in intake.md"""
+    try:
+        with open(intake_path) as f:
+            return sum(1 for line in f if line.startswith("- [ ]"))
+    except FileNotFoundError:
+        return 0
+
+SEGMENT_NAME = re.compile(r"^log\.jsonl(\.sealed-.+)?$|\.seg$")
+
+def log_segments(front_desk):
+    """(segment name, size in bytes) for the live log, sealed copies and packed segments"""
+    out = []
+    for path in sorted(pathlib.Path(front_desk).iterdir()):
+        if path.is_file() and SEGMENT_NAME.search(path.name):
+            out.append((path.name, path.stat().st_size))
+    return out
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    front_desk = pathlib.Path(argv[0] if argv else "front-desk")
+    samples = [("front_desk_intake_backlog", intake_backlog(front_desk / "intake.md"), {})]
+    if front_desk.exists():
+        for name, size in log_segments(front_desk):
+            samples.append(("front_desk_log_segment_bytes", size, {"segment": name}))
+    target = emit("collect", samples)
+    if target:
+        print(f"metrics written: {target}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
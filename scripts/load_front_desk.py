@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Load generator for the front desk log writers.
+
+Replays a mix of the three writers that share log.jsonl - cron triage.py
+runs, interactive triage sessions and marriage_protection daemon events -
+from several processes at once, against a temp copy of front-desk/. Each
+worker draws its events from a seeded RNG, so a run with the same --seed,
+--mix and --procs replays the same sequence. Afterwards it prints append
+latency percentiles per writer and overall throughput, then runs
+verify_log.py on the result to prove the chain held.
+
+Usage:
+  load_front_desk.py [--duration 10] [--rate 50] [--procs 4]
+                     [--mix triage=3,interactive=1,marriage=6] [--seed 1] [--keep]
+
+--rate is events/second across all workers; --rate 0 runs unthrottled to
+find the writers' throughput ceiling.
+"""
+
+import argparse
+import json
+import multiprocessing
+import pathlib
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+import front_desk_metrics
+import triage
+import triage_interactive
+import verify_log
+
+FRONT_DESK = pathlib.Path("front-desk")
+KINDS = ("triage", "interactive", "marriage")
+DEFAULT_MIX = "triage=3,interactive=1,marriage=6"
+PRIORITIES = (("12h", "urgent"), ("24h", "high"), ("48h", "medium"), ("72h", "low"))
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in KINDS:
+            raise argparse.ArgumentTypeError(f"unknown writer {kind!r} (choose from {', '.join(KINDS)})")
+        mix[kind] = float(weight or 1)
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("mix needs at least one positive weight")
+    return mix
+
+def write_triage(ctx, rng, seq):
+    # what a cron triage.py run does for one intake bullet
+    triage.triage_notes([f"load note {ctx['worker']}-{seq}"], ctx["triage"], ctx["log"], "intake", "general")
+
+def write_interactive(ctx, rng, seq):
+    due, priority = rng.choice(PRIORITIES)
+    # the real session path: note_id is read from the log under the lock
+    triage_interactive.save_entries(
+        [(f"load raw {ctx['worker']}-{seq}", f"load-action-{seq}", due, priority)], ctx["triage"], ctx["log"])
+
+def write_marriage(ctx, rng, seq):
+    # marriage_protection.sh appends one line with `echo >>`, without the lock
+    ts = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    entry = {"timestamp": ts, "module": "marriage_protection", "action": "heartbeat",
+             "seconds_today": seq, "task_ref": None, "data": {}, "source": "marriage_protection"}
+    with open(ctx["log"], "a") as f:
+        f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+WRITERS = {"triage": write_triage, "interactive": write_interactive, "marriage": write_marriage}
+
+def worker(ctx):
+    """Run one writer process; returns (kind, latency, lag) per event
+
+    Events are scheduled open-loop at a fixed interval, so a slow append
+    shows up as lag on the following events rather than lowering the rate.
+    """
+    rng = random.Random(ctx["seed"] * 1000 + ctx["worker"])
+    kinds, weights = zip(*ctx["mix"].items())
+    interval = 1.0 / ctx["rate"] if ctx["rate"] else 0.0
+    start = time.monotonic() + 0.1
+    deadline = start + ctx["duration"]
+    samples, seq = [], 0
+    while True:
+        due = start + seq * interval
+        now = time.monotonic()
+        if due >= deadline or now >= deadline:
+            break
+        if due > now:
+            time.sleep(due - now)
+        kind = rng.choices(kinds, weights)[0]
+        began = time.monotonic()
+        WRITERS[kind](ctx, rng, seq)
+        samples.append((kind, time.monotonic() - began, max(0.0, began - due)))
+        seq += 1
+    return samples
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+def prepare(workdir, source=FRONT_DESK):
+    """Copy the live log and triage shards; the real front-desk/ is never written"""
+    target = workdir / "front-desk"
+    target.mkdir(parents=True)
+    if (source / "log.jsonl").exists():
+        shutil.copy2(source / "log.jsonl", target / "log.jsonl")
+    if (source / "triage").is_dir():
+        shutil.copytree(source / "triage", target / "triage")
+    return target
+
+def duplicate_ids(log):
+    """T-ids and note_ids that were handed out twice, which the lock is also meant to prevent"""
+    seen, dupes = set(), set()
+    with open(log, "rb") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(entry, dict):
+                continue
+            if entry.get("type") == "triage":
+                key = entry["id"]
+            elif "note_id" in entry and "event" not in entry:
+                key = f"note_id={entry['note_id']}"
+            else:
+                continue
+            (dupes if key in seen else seen).add(key)
+    return sorted(dupes)
+
+def report(samples, wall, args):
+    total = len(samples)
+    print(f"\n{total} events in {wall:.2f}s from {args.procs} processes "
+          f"({total / wall:.1f}/s, target {'unthrottled' if not args.rate else f'{args.rate:g}/s'})")
+    print(f"{'writer':<12} {'events':>7} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8} {'late':>6}")
+    rows = []
+    for kind in KINDS + ("all",):
+        picked = [s for s in samples if kind == "all" or s[0] == kind]
+        if not picked:
+            continue
+        lat = [s[1] * 1000 for s in picked]
+        late = sum(1 for s in picked if args.rate and s[2] > args.procs / args.rate)
+        p50, p90, p99 = (percentile(lat, p) for p in (50, 90, 99))
+        print(f"{kind:<12} {len(picked):>7} {p50:>8.2f} {p90:>8.2f} {p99:>8.2f} {max(lat):>8.2f} {late:>6}")
+        rows.append((kind, p50, p99))
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent load generator for the front desk log")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run (default 10)")
+    parser.add_argument("--rate", type=float, default=50.0, help="events/second across all workers; 0 = unthrottled")
+    parser.add_argument("--procs", type=int, default=4, help="writer processes (default 4)")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"writer weights (default {DEFAULT_MIX})")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--source", type=pathlib.Path, default=FRONT_DESK, help="front-desk dir to copy")
+    parser.add_argument("--keep", action="store_true", help="keep the temp copy for inspection")
+    args = parser.parse_args(argv)
+
+    workdir = pathlib.Path(tempfile.mkdtemp(prefix="front-desk-load-"))
+    try:
+        target = prepare(workdir, args.source)
+        log = target / "log.jsonl"
+        base = [{
+            "worker": w,
+            "seed": args.seed,
+            "mix": args.mix,
+            "rate": args.rate / args.procs,
+            "duration": args.duration,
+            "log": log,
+            "triage": target / "triage",
+        } for w in range(args.procs)]
+        print(f"load: {args.procs} processes, mix {args.mix}, seed {args.seed}, copy in {target}")
+
+        started = time.monotonic()
+        with multiprocessing.Pool(args.procs) as pool:
+            results = pool.map(worker, base)
+        wall = time.monotonic() - started - 0.1
+        samples = [s for result in results for s in result]
+        rows = report(samples, wall, args)
+
+        print(f"\nverify_log.py {log}:")
+        status = verify_log.main(str(log))
+        dupes = duplicate_ids(log)
+        if dupes:
+            print(f"ERROR: {len(dupes)} ids assigned twice (first: {dupes[0]})")
+            status = status or 1
+
+        front_desk_metrics.record_load(len(samples) / wall, rows)
+        return status
+    finally:
+        if args.keep:
+            print(f"kept {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    sys.exit(main())
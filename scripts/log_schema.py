@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Declarative schemas for front desk log entries.
+
+Each entry kind (triage, note, marriage_protection, ...) declares its
+required and optional fields with their types, plus regex patterns for
+fields with a fixed shape. Schemas are compiled once at import into plain
+closures (a key-subset check, isinstance checks, precompiled matches) so
+writers can validate in the append path and verify_log.py can validate
+every entry for a small fraction of the cost of hashing it.
+
+Run with --bench to compare validation time against hashing time.
+"""
+
+import hashlib
+import json
+import re
+import sys
+import time
+
+from log_segment import entry_kind
+
+HASH = r"^[0-9a-f]{64}$"
+TS = r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d+)?(Z|[+-]\d{2}:\d{2})?$"
+
+CHAINED = {"prev_hash": str, "hash": str}
+# hex-ness of hash/prev_hash is left to verification, which compares them with digests
+CHAINED_LENGTHS = {"prev_hash": (0, 64), "hash": (64,)}
+CHAINED_PATTERNS = {"ts": TS}
+
+SCHEMAS = {
+    "comment": {
+        "required": {"_comment": str},
+    },
+    "triage": {
+        "required": {"id": str, "note": str, "status": str, "src": str, "ts": str, "type": str, **CHAINED},
+        "lengths": CHAINED_LENGTHS,
+        "patterns": {"id": r"^T-\d{4,}$", **CHAINED_PATTERNS},
+    },
+    "repair": {
+        "required": {"type": str, "ts": str, "from_line": int, "sealed": str, "sealed_sha256": str, **CHAINED},
+        "optional": {"rehashed": int, "dropped": int},
+        "lengths": CHAINED_LENGTHS,
+        "patterns": {"sealed_sha256": HASH, **CHAINED_PATTERNS},
+    },
+    "decision": {
+        "required": {"type": str, "ts": str, "decision": str, **CHAINED},
+        "optional": {"rationale": str, "authority": str},
+        "lengths": CHAINED_LENGTHS,
+        "patterns": CHAINED_PATTERNS,
+    },
+    "note": {
+        "required": {"note_id": int, "status": str, "ts": str},
+        "optional": {"action": str, "raw": str, "priority": str, "due": str, **CHAINED},
+        "lengths": CHAINED_LENGTHS,
+        "patterns": {"ts": TS, "priority": r"^(urgent|high|medium|low)$"},
+    },
+    "event": {
+        "required": {"ts": str},
+        "optional": {"event": str, "violation": str, "note_id": int},
+        "patterns": {"ts": TS},
+    },
+    "marriage_protection": {
+        "required": {"timestamp": str, "module": str, "action": str, "source": str},
+        "optional": {"seconds_today": int, "task_ref": (str, type(None)), "data": dict},
+        "patterns": {"timestamp": TS},
+    },
+}
+
+def _type_set(types):
+    # exact type checks: json.loads only builds these, and bool is kept
+    # apart from int unless a schema declares it
+    return frozenset(types if isinstance(types, tuple) else (types,))
+
+def compile_schema(kind, schema, strict=True):
+    """Turn a declarative schema into a validator returning an error or None
+
+    The schema is flattened once into a required-key set and (key, check)
+    lists, so validating an entry is a key-subset test plus short loops.
+    strict=False is the tier verify_log.py runs on every line: presence and
+    types. Lengths and patterns are left to the append path; a sealed entry
+    need not have passed them (entries older than the schemas, hand-added
+    decisions), but a wrong type is always an error.
+    """
+    required = frozenset(schema.get("required", {}))
+    fields = {**schema.get("required", {}), **schema.get("optional", {})}
+    types = [(k, _type_set(t)) for k, t in fields.items()]
+    lengths = [(k, frozenset(v)) for k, v in schema.get("lengths", {}).items()] if strict else []
+    patterns = [(k, re.compile(p).match) for k, p in schema.get("patterns", {}).items()] if strict else []
+
+    def validate(entry):
+        if not entry.keys() >= required:
+            return f"{kind}: missing {', '.join(sorted(required - entry.keys()))}"
+        for key, allowed in types:
+            if key in entry and type(entry[key]) not in allowed:
+                return f"{kind}: {key} has type {type(entry[key]).__name__}"
+        for key, allowed in lengths:
+            if key in entry and len(entry[key]) not in allowed:
+                return f"{kind}: {key} has length {len(entry[key])}"
+        for key, match in patterns:
+            if key in entry and not match(entry[key]):
+                return f"{kind}: {key} is malformed ({entry[key]!r})"
+        return None
+
+    return validate
+
+VALIDATORS = {kind: compile_schema(kind, schema) for kind, schema in SCHEMAS.items()}
+# presence/type only: what verify_log.py runs on every entry
+FAST_VALIDATORS = {kind: compile_schema(kind, schema, strict=False) for kind, schema in SCHEMAS.items()}
+
+def kind_of(entry):
+    """Typed entries use their "type"; others are classified by writer"""
+    return entry["type"] if "type" in entry else entry_kind(entry)
+
+def validate(entry, strict=True):
+    """Return an error string for a malformed entry, None if it is valid
+
+    Kinds without a schema are accepted, so new event types can be logged
+    before a schema is written for them.
+    """
+    if not isinstance(entry, dict):
+        return "entry is not a JSON object"
+    validator = (VALIDATORS if strict else FAST_VALIDATORS).get(kind_of(entry))
+    return validator(entry) if validator else None
+
+def check(entry):
+    """Raise ValueError for a malformed entry; used in the append path"""
+    error = validate(entry)
+    if error:
+        raise ValueError(f"refusing to log malformed entry: {error}")
+
+def bench(path, repeat=7):
+    """Time validation against canonical hashing over every entry in path
+
+    Each pass is repeated and the fastest run kept, which is the usual way
+    to keep scheduler noise out of a micro-benchmark.
+    """
+    with open(path, "rb") as f:
+        lines = [l for l in f if l.strip()]
+    entries = [e for e in map(json.loads, lines) if isinstance(e, dict)]
+
+    def canon_hash(e):
+        body = json.dumps({k: v for k, v in e.items() if k != "hash"},
+                          sort_keys=True, separators=(",", ":")).encode("utf-8")
+        return hashlib.sha256(body).hexdigest()
+
+    passes = {
+        "hash": lambda: [canon_hash(e) for e in entries],
+        "validate": lambda: [validate(e, strict=False) for e in entries],
+        "strict": lambda: [validate(e) for e in entries],
+        # what verify_log.py pays per entry without a schema: decode + hash
+        "verify": lambda: [canon_hash(json.loads(l)) for l in lines],
+    }
+    best = {name: float("inf") for name in passes}
+    for _ in range(repeat):
+        for name, run in passes.items():
+            start = time.perf_counter()
+            run()
+            best[name] = min(best[name], time.perf_counter() - start)
+
+    pct = {k: v / best["hash"] * 100 if best["hash"] else 0.0 for k, v in best.items()}
+    print(f"{len(entries)} entries, best of {repeat}")
+    print(f"hash:     {best['hash'] * 1000:.1f} ms")
+    print(f"validate: {best['validate'] * 1000:.1f} ms ({pct['validate']:.1f}% of hashing, verify_log.py)")
+    print(f"strict:   {best['strict'] * 1000:.1f} ms ({pct['strict']:.1f}% of hashing, append path)")
+    print(f"verify pass overhead: {best['validate'] / best['verify'] * 100:.1f}% (decode + hash = {best['verify'] * 1000:.1f} ms)")
+    return pct["validate"]
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "--bench":
+        bench(argv[1] if len(argv) > 1 else "front-desk/log.jsonl")
+        return 0
+    path = argv[0] if argv else "front-desk/log.jsonl"
+    bad = 0
+    with open(path, "rb") as f:
+        for i, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                error = validate(json.loads(line))
+            except json.JSONDecodeError as e:
+                error = f"not JSON ({e})"
+            if error:
+                print(f"ERROR line {i}: {error}")
+                bad += 1
+    print(f"{'OK' if not bad else 'FAIL'}: {bad} malformed entries")
+    return 1 if bad else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Length-prefixed binary segments for the front desk log.
+
+A segment is MAGIC followed by records of the form
+
+    type (1 byte) | length (4 bytes, big-endian) | payload
+
+where the payload is the original JSONL line, newline included. Readers can
+skip records of uninteresting types (e.g. marriage_protection) with a seek,
+without decoding them, and unpacking a segment reproduces the JSONL file
+byte for byte, so verify_log.py hashes are unchanged.
+
+Usage:
+  log_segment.py pack log.jsonl log.seg
+  log_segment.py unpack log.seg log.jsonl
+  log_segment.py cat log.seg [--skip marriage_protection,comment]
+  log_segment.py stats log.seg
+"""
+
+import argparse
+import collections
+import json
+import os
+import struct
+import sys
+
+MAGIC = b"FDSEG\x01\n"
+HEADER = struct.Struct(">BI")
+
+RECORD_TYPES = {
+    "comment": 0,
+    "triage": 1,
+    "marriage_protection": 2,
+    "note": 3,
+    "event": 4,
+    "other": 5,
+    "blank": 6,
+    "invalid": 7,
+}
+TYPE_NAMES = {code: name for name, code in RECORD_TYPES.items()}
+
+def entry_kind(entry):
+    """Classify a decoded log entry by the writer that produced it"""
+    if "_comment" in entry:
+        return "comment"
+    if entry.get("module") == "marriage_protection":
+        return "marriage_protection"
+    if entry.get("type") == "triage":
+        return "triage"
+    if "note_id" in entry and "event" not in entry:
+        return "note"
+    if "event" in entry or "violation" in entry:
+        return "event"
+    return "other"
+
+def line_kind(line):
+    """Classify a raw JSONL line"""
+    if not line.strip():
+        return "blank"
+    try:
+        entry = json.loads(line)
+    except json.JSONDecodeError:
+        return "invalid"
+    if not isinstance(entry, dict):
+        return "invalid"
+    return entry_kind(entry)
+
+def is_segment(f):
+    """Check for the segment magic, leaving f at offset 0"""
+    f.seek(0)
+    magic = f.read(len(MAGIC))
+    f.seek(0)
+    return magic == MAGIC
+
+def iter_records(f, skip=()):
+    """Yield (record number, type name, payload); skipped records are not read"""
+    skip_codes = {RECORD_TYPES[name] for name in skip}
+    # seeking past EOF succeeds, so skipped records are checked against the size
+    size = os.fstat(f.fileno()).st_size
+    f.seek(len(MAGIC))
+    n = 0
+    while True:
+        head = f.read(HEADER.size)
+        if not head:
+            return
+        if len(head) < HEADER.size:
+            raise ValueError(f"record {n + 1}: truncated header")
+        code, length = HEADER.unpack(head)
+        n += 1
+        if code in skip_codes:
+            if f.seek(length, os.SEEK_CUR) > size:
+                raise ValueError(f"record {n}: truncated payload")
+            continue
+        payload = f.read(length)
+        if len(payload) < length:
+            raise ValueError(f"record {n}: truncated payload")
+        yield n, TYPE_NAMES.get(code, "other"), payload
+
+def encode_record(line):
+    return HEADER.pack(RECORD_TYPES[line_kind(line)], len(line)) + line
+
+def pack(src, dst):
+    """Convert a JSONL log into a segment. Returns the record count"""
+    n = 0
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        fout.write(MAGIC)
+        for line in fin:
+            fout.write(encode_record(line))
+            n += 1
+    return n
+
+def unpack(src, dst):
+    """Convert a segment back into byte-identical JSONL. Returns the record count"""
+    n = 0
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        if not is_segment(fin):
+            raise ValueError(f"not a log segment: {src}")
+        for n, _, payload in iter_records(fin):
+            fout.write(payload)
+    return n
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Front desk log segments")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    for name in ("pack", "unpack"):
+        p = sub.add_parser(name)
+        p.add_argument("src")
+        p.add_argument("dst")
+    p_cat = sub.add_parser("cat", help="print records as JSONL")
+    p_cat.add_argument("src")
+    p_cat.add_argument("--skip", default="", help="comma-separated record types")
+    p_stats = sub.add_parser("stats", help="count records per type")
+    p_stats.add_argument("src")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.cmd == "pack":
+            print(f"packed {pack(args.src, args.dst)} records: {args.dst}")
+        elif args.cmd == "unpack":
+            print(f"unpacked {unpack(args.src, args.dst)} records: {args.dst}")
+        else:
+            skip = [s for s in getattr(args, "skip", "").split(",") if s]
+            unknown = set(skip) - set(RECORD_TYPES)
+            if unknown:
+                print(f"Unknown record types: {', '.join(sorted(unknown))}")
+                return 2
+            counts = collections.Counter()
+            with open(args.src, "rb") as f:
+                if not is_segment(f):
+                    print(f"Not a log segment: {args.src}")
+                    return 1
+                for _, kind, payload in iter_records(f, skip):
+                    if args.cmd == "cat":
+                        sys.stdout.buffer.write(payload)
+                    counts[kind] += 1
+            if args.cmd == "stats":
+                for kind, count in counts.most_common():
+                    print(f"{kind}: {count}")
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
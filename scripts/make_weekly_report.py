@@ -1,8 +1,16 @@
 #!/usr/bin/env python3
-import json, datetime, pathlib, collections
+import json, datetime, pathlib, collections, sys, time
 import os
 
+import front_desk_metrics
+
+import report_cache
+
+# Bump when the report layout below changes so cached reports are regenerated
+TEMPLATE_VERSION = 1
+
 def main():
+    started = time.monotonic()
     log_path = pathlib.Path("front-desk/log.jsonl")
     if not log_path.exists():
         print("No log file found")
@@ -14,6 +22,21 @@ def main():
     week_start = today - datetime.timedelta(days=7)
     week_start_str = week_start.strftime("%Y-%m-%d")
     
+    reports_dir = pathlib.Path("reports")
+    if len(sys.argv) > 1:
+        report_file = pathlib.Path(sys.argv[1])
+    else:
+        report_file = reports_dir / f"week-{week_num:02d}.md"
+    
+    # Skip regeneration when no new events arrived since the last run
+    key = report_cache.input_key(log_path, TEMPLATE_VERSION, week_start_str, today.isoformat())
+    cached = report_cache.lookup(report_file, key)
+    if cached is not None:
+        front_desk_metrics.record_report("report_weekly", report_file, started, skipped=True)
+        print(f"Weekly report unchanged: {report_file}")
+        print(f"Total events: {cached.get('total_events', 0)}, New items: {cached.get('new_items', 0)}")
+        return
+    
     # Parse log entries
     by_type = collections.Counter()
     by_status = collections.Counter()
@@ -40,10 +63,7 @@ def main():
                 missed_days.append(entry_date)
     
     # Generate report
-    reports_dir = pathlib.Path("reports")
-    reports_dir.mkdir(parents=True, exist_ok=True)
-    
-    report_file = reports_dir / f"week-{week_num:02d}.md"
+    report_file.parent.mkdir(parents=True, exist_ok=True)
     
     with open(report_file, "w") as f:
         f.write(f"# Front Desk – Weekly Summary (Week {week_num})\n\n")
@@ -89,6 +109,8 @@ def main():
         else:
             f.write(f"\n❌ **Week Goal Missed:** Need ≥10 events (have {total_events}), ≤2 missed days (have {len(missed_days)})\n")
     
+    report_cache.record(report_file, key, {"total_events": sum(by_type.values()), "new_items": len(new_ids)})
+    front_desk_metrics.record_report("report_weekly", report_file, started, skipped=False)
     print(f"Weekly report written: {report_file}")
     print(f"Total events: {sum(by_type.values())}, New items: {len(new_ids)}")
 
@@ -50,7 +50,7 @@ get_work_seconds() {
 # Get most recent T-ID from intake
 get_current_task_ref() {
     if [[ -f "front-desk/intake.md" ]]; then
-        local task_ref=$(grep -o "T-[0-9]\{4\}" "front-desk/triage.md" 2>/dev/null | tail -1)
+        local task_ref=$(grep -o "T-[0-9]\{4\}" "front-desk/triage/index.md" 2>/dev/null | tail -1)
         if [[ -n "$task_ref" ]]; then
             echo "\"$task_ref\""
         else
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Incremental mirror for the front desk log.
+
+Ships only the bytes appended since the last sync to each target directory
+(local or mounted). The mirror's current size is the sync offset, so no
+extra state is kept. Before appending, the bytes just below that offset
+are compared with the source to catch a diverged or rewritten log; after
+appending, the mirror's chain head is checked against the source. --full
+copies into a temp file next to the mirror and only replaces the mirror
+once that copy's chain head matches, so a failed resync keeps the old one.
+
+Usage:
+  mirror_log.py [--log front-desk/log.jsonl] [--full] TARGET_DIR [TARGET_DIR ...]
+"""
+
+import argparse
+import os
+import pathlib
+import sys
+
+from triage import chain_head
+
+CHUNK = 1 << 20
+BOUNDARY_BYTES = 4096
+
+def same_boundary(src, dst, offset):
+    """Compare the bytes just below offset in both files"""
+    start = max(0, offset - BOUNDARY_BYTES)
+    src.seek(start)
+    dst.seek(start)
+    return src.read(offset - start) == dst.read(offset - start)
+
+def ship(src, dst, offset, end):
+    """Append src[offset:end] to dst and fsync it"""
+    src.seek(offset)
+    remaining = end - offset
+    while remaining:
+        chunk = src.read(min(CHUNK, remaining))
+        if not chunk:
+            break
+        dst.write(chunk)
+        remaining -= len(chunk)
+    dst.flush()
+    os.fsync(dst.fileno())
+
+def check_head(log, copy, end):
+    head = chain_head(log, end)
+    mirrored = chain_head(copy, end)
+    if mirrored != head:
+        raise RuntimeError(f"{copy} chain head {mirrored or '-'} != source {head or '-'}")
+    return head
+
+def sync(log, target, full=False):
+    """Mirror log into target. Returns (bytes shipped, chain head)"""
+    target.mkdir(parents=True, exist_ok=True)
+    mirror = target / log.name
+    end = log.stat().st_size
+
+    if full:
+        tmp = target / f".{log.name}.tmp"
+        try:
+            with open(log, "rb") as src, open(tmp, "wb") as dst:
+                ship(src, dst, 0, end)
+            head = check_head(log, tmp, end)
+            os.replace(tmp, mirror)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+        return end, head
+
+    offset = mirror.stat().st_size if mirror.exists() else 0
+    if offset > end:
+        raise RuntimeError(f"{mirror} is ahead of the source ({offset} > {end} bytes); source truncated?")
+
+    with open(log, "rb") as src, open(mirror, "a+b") as dst:
+        if not same_boundary(src, dst, offset):
+            raise RuntimeError(f"{mirror} diverged from the source near byte {offset}; rerun with --full")
+        ship(src, dst, offset, end)
+    return end - offset, check_head(log, mirror, end)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mirror the front desk log incrementally")
+    parser.add_argument("targets", nargs="+", type=pathlib.Path)
+    parser.add_argument("--log", type=pathlib.Path, default=pathlib.Path("front-desk/log.jsonl"))
+    parser.add_argument("--full", action="store_true", help="recopy the whole log, replacing the mirror once the copy checks out")
+    args = parser.parse_args(argv)
+
+    if not args.log.exists():
+        print(f"No log file found: {args.log}")
+        return 1
+
+    status = 0
+    for target in args.targets:
+        try:
+            shipped, head = sync(args.log, target, args.full)
+        except (OSError, RuntimeError) as e:
+            print(f"ERROR {target}: {e}")
+            status = 1
+            continue
+        print(f"mirrored {shipped} bytes -> {target} (head {head[:12] or '-'})")
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
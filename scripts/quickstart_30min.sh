@@ -36,7 +36,8 @@ echo "Creating directory structure..."
 show_time
 
 mkdir -p front-desk scripts reports
-touch front-desk/intake.md front-desk/triage.md front-desk/log.jsonl
+mkdir -p front-desk/triage
+touch front-desk/intake.md front-desk/log.jsonl
 touch reports/week-01.md
 
 # Get UTC time
@@ -102,13 +103,15 @@ echo "Triaging first 5 items..."
 
 DATE_TODAY=$(date -u '+%Y-%m-%d')
 
-cat > front-desk/triage.md << EOF
+TRIAGE_SHARD=$(python3 scripts/triage_shards.py active)
+cat > "$TRIAGE_SHARD" << EOF
 $DATE_TODAY | note_id=1 | action: fix-login-form | due: 48h
 $DATE_TODAY | note_id=2 | action: call-customer | due: 24h
 $DATE_TODAY | note_id=3 | action: check-competitor-sites | due: 7d
 $DATE_TODAY | note_id=4 | action: renew-ssl-cert | due: 48h
 $DATE_TODAY | note_id=5 | action: review-pr-queue | due: 24h
 EOF
+python3 scripts/triage_shards.py rebuild-index > /dev/null
 
 show_time
 echo "✓ 5 items triaged"
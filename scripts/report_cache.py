@@ -0,0 +1,70 @@
+"""
+Content-addressed cache for generated front desk reports.
+
+A report is keyed by a digest of its inputs: the log range it consumed, the
+START.yml contents and the generator's template version. The log is
+append-only and chain-hashed, so its size plus the bytes at its tail identify
+the consumed range without reading the whole file. Generators call
+lookup() before rendering and skip the write when the key is unchanged.
+"""
+
+import hashlib
+import json
+import os
+import pathlib
+
+CACHE_PATH = pathlib.Path("reports/.report-cache.json")
+START_PATH = pathlib.Path("START.yml")
+
+# Bytes read from the end of the log to fingerprint its tail
+TAIL_BYTES = 4096
+
+def log_range(log_path):
+    """Return (size, tail digest) for the log range [0, size)"""
+    try:
+        with open(log_path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - TAIL_BYTES))
+            tail = f.read()
+    except FileNotFoundError:
+        return 0, ""
+    return size, hashlib.sha256(tail).hexdigest()
+
+def input_key(log_path, template_version, *extra):
+    """Digest of everything a report is rendered from"""
+    h = hashlib.sha256()
+    size, tail = log_range(log_path)
+    h.update(f"log:{size}:{tail}\n".encode("utf-8"))
+    try:
+        h.update(b"start:" + START_PATH.read_bytes() + b"\n")
+    except FileNotFoundError:
+        h.update(b"start:-\n")
+    h.update(f"template:{template_version}\n".encode("utf-8"))
+    for item in extra:
+        h.update(f"extra:{item}\n".encode("utf-8"))
+    return h.hexdigest()
+
+def _load(cache_path):
+    try:
+        return json.loads(cache_path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def lookup(report_path, key, cache_path=CACHE_PATH):
+    """Return the cached metadata if report_path is current for key, else None"""
+    if not pathlib.Path(report_path).exists():
+        return None
+    hit = _load(cache_path).get(str(report_path))
+    if hit and hit.get("key") == key:
+        return hit.get("meta", {})
+    return None
+
+def record(report_path, key, meta=None, cache_path=CACHE_PATH):
+    """Remember that report_path was rendered from key"""
+    cache = _load(cache_path)
+    cache[str(report_path)] = {"key": key, "meta": meta or {}}
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_path.with_name(cache_path.name + ".tmp")
+    tmp.write_text(json.dumps(cache, sort_keys=True, indent=2) + "\n")
+    os.replace(tmp, cache_path)
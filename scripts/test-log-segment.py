@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Regression checks for log_segment.py.
+Packs a mixed log into a segment, verifies and unpacks it, and checks that a
+segment cut off inside a skipped record is reported rather than trusted.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+SCRIPTS = os.path.dirname(os.path.abspath(__file__))
+SEGMENT = os.path.join(SCRIPTS, 'log_segment.py')
+VERIFY = os.path.join(SCRIPTS, 'verify_log.py')
+sys.path.insert(0, SCRIPTS)
+
+import triage
+
+
+def create_mixed_log(path, count):
+    """Chained triage entries, each followed by an unchained marriage_protection record."""
+    prev = ''
+    with open(path, 'w') as f:
+        for i in range(count):
+            entry = {
+                'id': f'T-{i + 1:04d}',
+                'note': f'n{i}',
+                'status': 'open',
+                'src': 'intake',
+                'ts': '2025-08-20T10:00:00Z',
+                'type': 'triage',
+                'prev_hash': prev,
+            }
+            entry['hash'] = prev = triage.digest(entry)
+            f.write(json.dumps(entry, sort_keys=True, separators=(',', ':')) + '\n')
+            heartbeat = {
+                'timestamp': '2025-08-20T10:00:00Z',
+                'module': 'marriage_protection',
+                'action': 'heartbeat',
+                'seconds_today': i,
+                'source': 'marriage_protection',
+            }
+            f.write(json.dumps(heartbeat) + '\n')
+
+
+def run(script, *args):
+    result = subprocess.run([sys.executable, script, *args], capture_output=True, text=True)
+    return result.returncode, result.stdout + result.stderr
+
+
+def test_pack_verify_unpack_round_trip():
+    """A packed log verifies with the same entry count and unpacks byte for byte."""
+    print('Testing pack -> verify -> unpack...')
+    workdir = tempfile.mkdtemp()
+    try:
+        log = os.path.join(workdir, 'log.jsonl')
+        seg = os.path.join(workdir, 'log.seg')
+        restored = os.path.join(workdir, 'restored.jsonl')
+        create_mixed_log(log, 60)
+
+        code, out = run(SEGMENT, 'pack', log, seg)
+        if code != 0:
+            print(f'❌ pack failed:\n{out}')
+            return False
+        code, out = run(VERIFY, seg)
+        if code != 0 or 'OK 60 entries' not in out:
+            print(f'❌ Packed segment should verify with 60 entries:\n{out}')
+            return False
+        code, out = run(SEGMENT, 'unpack', seg, restored)
+        with open(log, 'rb') as a, open(restored, 'rb') as b:
+            identical = a.read() == b.read()
+        if code != 0 or not identical:
+            print(f'❌ Unpacked log is not byte-identical to the original:\n{out}')
+            return False
+        print('✅ Segment verifies and unpacks byte-identical')
+        return True
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def test_truncated_skipped_record():
+    """Cutting a segment inside a trailing skipped record must fail verify like unpack."""
+    print('Testing a segment truncated inside a marriage_protection record...')
+    workdir = tempfile.mkdtemp()
+    try:
+        log = os.path.join(workdir, 'log.jsonl')
+        seg = os.path.join(workdir, 'log.seg')
+        create_mixed_log(log, 5)
+        run(SEGMENT, 'pack', log, seg)
+        # the last record is a heartbeat, which verify skips without reading
+        with open(seg, 'r+b') as f:
+            f.truncate(os.path.getsize(seg) - 10)
+
+        for script, args in ((VERIFY, (seg,)), (VERIFY, ('--fsck', seg)),
+                             (SEGMENT, ('unpack', seg, os.path.join(workdir, 'out.jsonl')))):
+            code, out = run(script, *args)
+            if code == 0 or 'record 10: truncated payload' not in out:
+                print(f'❌ {os.path.basename(script)} {" ".join(args[:-1])} accepted a truncated segment:\n{out}')
+                return False
+        print('✅ Verify, fsck and unpack all report the truncated record')
+        return True
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    success = test_pack_verify_unpack_round_trip()
+    success = test_truncated_skipped_record() and success
+    sys.exit(0 if success else 1)
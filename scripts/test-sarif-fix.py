@@ -7,6 +7,7 @@ and verifies the fix works correctly.
 
 import json
 import os
+import shutil
 import tempfile
 import subprocess
 import sys
@@ -139,6 +140,86 @@ def test_sarif_fix():
             if os.path.exists(path):
                 os.unlink(path)
 
+def create_test_sbom(run=0):
+    """Create a minimal syft-style SPDX SBOM declaring one npm package.
+
+    Like syft, every run gets its own documentNamespace and creation time.
+    """
+    return {
+        "spdxVersion": "SPDX-2.3",
+        "SPDXID": "SPDXRef-DOCUMENT",
+        "documentNamespace": f"https://anchore.com/syft/dir/test-{run}-{os.urandom(4).hex()}",
+        "creationInfo": {
+            "creators": ["Tool: syft-1.0.0"],
+            "created": f"2025-08-2{run}T10:00:00Z"
+        },
+        "packages": [
+            {
+                "name": "minimist",
+                "SPDXID": "SPDXRef-Package-npm-minimist",
+                "versionInfo": "1.2.5",
+                "sourceInfo": "acquired package info from installed node module manifest file: /pnpm-lock.yaml"
+            }
+        ],
+        "relationships": []
+    }
+
+def test_sbom_resolution():
+    """Test that results resolve to manifest paths via the cached SBOM index."""
+    print("🧪 Testing SBOM-backed location resolution...")
+    
+    workdir = tempfile.mkdtemp()
+    input_path = os.path.join(workdir, 'input.sarif')
+    output_path = os.path.join(workdir, 'output.sarif')
+    sbom_path = os.path.join(workdir, 'sbom.spdx.json')
+    cache_dir = os.path.join(workdir, 'cache')
+    
+    try:
+        test_sarif = create_test_sarif()
+        test_sarif['runs'][0]['results'][0]['message']['text'] = (
+            "A high vulnerability in npm package: minimist, version 1.2.5 was found at: "
+        )
+        with open(input_path, 'w') as f:
+            json.dump(test_sarif, f, indent=2)
+        script_path = os.path.join(os.path.dirname(__file__), 'fix-grype-sarif.py')
+        outputs = []
+        for run in range(2):
+            # regenerated SBOM: same packages, new namespace and timestamp
+            with open(sbom_path, 'w') as f:
+                json.dump(create_test_sbom(run), f)
+            result = subprocess.run([
+                sys.executable, script_path, input_path, output_path,
+                '--sbom', sbom_path, '--cache-dir', cache_dir
+            ], capture_output=True, text=True)
+            assert result.returncode == 0, f"Script failed: {result.stderr}"
+            outputs.append(result.stdout)
+        
+        assert '(built)' in outputs[0], f"First run should build the index: {outputs[0]}"
+        assert '(cached)' in outputs[1], f"Regenerated SBOM should reuse the cached index: {outputs[1]}"
+        
+        with open(output_path, 'r') as f:
+            fixed_sarif = json.load(f)
+        
+        uris = [
+            location['physicalLocation']['artifactLocation']['uri']
+            for result in fixed_sarif['runs'][0]['results']
+            for location in result['locations']
+        ]
+        assert uris[0] == 'pnpm-lock.yaml', f"Result 0 not resolved from SBOM: '{uris[0]}'"
+        assert uris[1].startswith('dependency-scan/'), f"Result 1 should fall back: '{uris[1]}'"
+        
+        print(f"✅ Resolved URIs: {uris}")
+        print("🎉 SBOM resolution works correctly.")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Test failed: {e}")
+        return False
+        
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
 if __name__ == '__main__':
     success = test_sarif_fix()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    success = test_sbom_resolution() and success
+    sys.exit(0 if success else 1)
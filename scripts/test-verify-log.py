@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Regression checks for verify_log.py.
+Builds throwaway hash-chained logs, damages them the way real incidents do,
+and verifies that every mode reports the damage.
+"""
+
+import hashlib
+import json
+import os
+import pathlib
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+SCRIPTS = os.path.dirname(os.path.abspath(__file__))
+VERIFY = os.path.join(SCRIPTS, 'verify_log.py')
+sys.path.insert(0, SCRIPTS)
+
+import triage
+import verify_log
+
+
+def create_test_log(path, count):
+    """Write a valid chain of count triage entries, with notes n0..n{count-1}."""
+    prev = ''
+    with open(path, 'w') as f:
+        for i in range(count):
+            entry = {
+                'id': f'T-{i + 1:04d}',
+                'note': f'n{i}',
+                'status': 'open',
+                'src': 'intake',
+                'ts': '2025-08-20T10:00:00Z',
+                'type': 'triage',
+                'prev_hash': prev,
+            }
+            body = json.dumps(entry, sort_keys=True, separators=(',', ':')).encode('utf-8')
+            entry['hash'] = hashlib.sha256(body).hexdigest()
+            prev = entry['hash']
+            f.write(json.dumps(entry, sort_keys=True, separators=(',', ':')) + '\n')
+
+
+def run_verify(*args):
+    result = subprocess.run([sys.executable, VERIFY, *args], capture_output=True, text=True)
+    return result.returncode, result.stdout + result.stderr
+
+
+def test_fast_fsck_sees_edits_before_anchor():
+    """An in-place edit before the last anchor must fail --fsck --fast."""
+    print('Testing --fsck --fast against an edit before the last anchor...')
+    workdir = tempfile.mkdtemp()
+    try:
+        log = os.path.join(workdir, 'log.jsonl')
+        create_test_log(log, 3000)
+
+        code, out = run_verify('--fsck', log)
+        if code != 0 or not os.path.exists(log + '.anchors'):
+            print(f'❌ Full fsck of a clean log failed or wrote no anchors:\n{out}')
+            return False
+
+        code, out = run_verify('--fsck', '--fast', log)
+        if code != 0 or 'OK 3000 entries' not in out:
+            print(f'❌ Fast fsck of an unchanged log should pass with 3000 entries:\n{out}')
+            return False
+
+        # same length, so every anchor offset still lines up
+        with open(log) as f:
+            lines = f.readlines()
+        lines[1499] = lines[1499].replace('"n1499"', '"X1499"')
+        with open(log, 'w') as f:
+            f.writelines(lines)
+
+        code, out = run_verify('--fsck', '--fast', log)
+        if code == 0 or 'ERROR line 1500: hash mismatch' not in out:
+            print(f'❌ Fast fsck missed the edit at line 1500:\n{out}')
+            return False
+        print('✅ Fast fsck reports the edit at line 1500')
+        return True
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def test_repair_from_rejects_bad_lines():
+    """--repair-from 0 used to fall through to a plain verify."""
+    print('Testing --repair-from with line numbers below 1...')
+    workdir = tempfile.mkdtemp()
+    try:
+        log = os.path.join(workdir, 'log.jsonl')
+        create_test_log(log, 3)
+        for line in ('0', '-5'):
+            code, out = run_verify('--repair-from', line, log)
+            if code != 2 or 'line number of 1 or more' not in out:
+                print(f'❌ --repair-from {line} was not rejected:\n{out}')
+                return False
+        print('✅ --repair-from rejects 0 and negative lines')
+        return True
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def test_repair_keeps_concurrent_appends():
+    """A triage append that waits on a running repair must land in the repaired log."""
+    print('Testing an append that races a repair...')
+    workdir = tempfile.mkdtemp()
+    original = verify_log._repair_locked
+    try:
+        log = os.path.join(workdir, 'log.jsonl')
+        create_test_log(log, 50)
+        locked = threading.Event()
+
+        def slow_repair(*args):
+            locked.set()
+            time.sleep(0.5)
+            return original(*args)
+
+        verify_log._repair_locked = slow_repair
+        repair = threading.Thread(target=verify_log.repair, args=(log, 10))
+        repair.start()
+        locked.wait()
+        # blocks on the lock the repair holds, then must reopen the replaced file
+        triage.triage_notes(['raced note'], pathlib.Path(workdir, 'triage'), pathlib.Path(log), 'intake', 'general')
+        repair.join()
+
+        with open(log) as f:
+            text = f.read()
+        code, out = run_verify(log)
+        if '"raced note"' not in text or code != 0:
+            print(f'❌ Append during repair was lost or broke the chain:\n{out}')
+            return False
+        print('✅ Append during repair lands after the repair entry')
+        return True
+    finally:
+        verify_log._repair_locked = original
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def test_sealed_entries_are_type_checked():
+    """A correctly hashed entry with wrong field types must still fail."""
+    print('Testing verify against a sealed but malformed entry...')
+    workdir = tempfile.mkdtemp()
+    try:
+        log = os.path.join(workdir, 'log.jsonl')
+        entry = {'id': 5, 'note': ['x'], 'status': None, 'src': 'intake',
+                 'ts': 'yesterday', 'type': 'triage', 'prev_hash': ''}
+        entry['hash'] = triage.digest(entry)
+        with open(log, 'w') as f:
+            f.write(json.dumps(entry, sort_keys=True, separators=(',', ':')) + '\n')
+        for args in ((log,), ('--fsck', log)):
+            code, out = run_verify(*args)
+            if code == 0 or 'schema (triage:' not in out:
+                print(f'❌ {" ".join(args[:-1]) or "verify"} accepted a sealed malformed entry:\n{out}')
+                return False
+        print('✅ Verify and fsck type-check sealed entries')
+        return True
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def test_repair_drops_malformed_entries():
+    """Repair must not rehash an entry the writers would have refused."""
+    print('Testing --repair-from over a malformed entry...')
+    workdir = tempfile.mkdtemp()
+    try:
+        log = os.path.join(workdir, 'log.jsonl')
+        create_test_log(log, 5)
+        with open(log) as f:
+            lines = f.readlines()
+        lines[3] = lines[3].replace('"status":"open"', '"status":null')
+        with open(log, 'w') as f:
+            f.writelines(lines)
+
+        code, out = run_verify('--repair-from', '3', log)
+        if code != 0 or 'dropped line 4: refusing to log malformed entry' not in out:
+            print(f'❌ Repair did not reject the malformed line:\n{out}')
+            return False
+        with open(log) as f:
+            entries = [json.loads(line) for line in f]
+        code, out = run_verify(log)
+        if code != 0 or 'n3' in {e.get('note') for e in entries} or entries[-1].get('dropped') != 1:
+            print(f'❌ Malformed entry survived the repair or was not counted:\n{out}')
+            return False
+        print('✅ Repair drops and counts the malformed entry')
+        return True
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    success = test_fast_fsck_sees_edits_before_anchor()
+    success = test_repair_from_rejects_bad_lines() and success
+    success = test_repair_keeps_concurrent_appends() and success
+    success = test_sealed_entries_are_type_checked() and success
+    success = test_repair_drops_malformed_entries() and success
+    sys.exit(0 if success else 1)
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Ticket state snapshot for the front desk log.
+
+Folds log.jsonl into the latest state per ticket (T-NNNN ids from triage.py,
+note_ids from triage_interactive.py) and stores it in front-desk/state.json
+together with the byte offset it covers. Queries load the snapshot and
+replay only the log tail written after that offset.
+
+The triage shards are folded in as well, since statuses are also changed by
+editing a row. Each shard's rows are cached with its size and mtime, so a
+query re-reads only the shards that changed (normally just the active one).
+A row's status and due override what the log recorded at triage time; a
+ticket is closed if either its row or its log entries say so.
+
+Usage:
+  ticket_state.py snapshot                 # rewrite the snapshot
+  ticket_state.py status T-0012            # latest state of one ticket
+  ticket_state.py open [--priority high]   # tickets that are not closed
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import pathlib
+import sys
+
+import triage_shards
+
+LOG_PATH = pathlib.Path("front-desk/log.jsonl")
+STATE_PATH = pathlib.Path("front-desk/state.json")
+TRIAGE_ROOT = triage_shards.ROOT
+STATE_VERSION = 2
+
+# Queries rewrite the snapshot once the replayed tail grows past this
+SNAPSHOT_EVERY = 500
+
+CLOSED_STATUSES = {"done", "closed", "cancelled", "wontfix"}
+TRACKED_FIELDS = ("status", "priority", "due", "note", "action", "src", "tag", "ts")
+# Row columns that override the log; the title only fills in a missing note
+ROW_FIELDS = ("status", "due", "tag")
+
+def ticket_key(entry):
+    """Return the ticket key an entry refers to, or None"""
+    if "id" in entry:
+        return str(entry["id"])
+    if "note_id" in entry:
+        return str(entry["note_id"])
+    return None
+
+def apply_entry(tickets, entry):
+    """Fold one log entry into the ticket map"""
+    if "_comment" in entry or entry.get("module") == "marriage_protection":
+        return
+    key = ticket_key(entry)
+    if key is None:
+        return
+    state = tickets.setdefault(key, {})
+    for field in TRACKED_FIELDS:
+        if entry.get(field) is not None:
+            state[field] = entry[field]
+
+def empty_state():
+    return {"version": STATE_VERSION, "offset": 0, "tail_sha": "", "tail_len": 0, "tickets": {}, "shards": {}}
+
+def load_snapshot(state_path):
+    """Load the snapshot, falling back to an empty state"""
+    try:
+        state = json.loads(state_path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return empty_state()
+    if state.get("version") != STATE_VERSION:
+        return empty_state()
+    return state
+
+def snapshot_matches(f, state):
+    """Check that the last line the snapshot consumed is still in the log"""
+    offset, tail_len = state["offset"], state["tail_len"]
+    if offset == 0:
+        return True
+    f.seek(0, os.SEEK_END)
+    if f.tell() < offset:
+        return False
+    f.seek(offset - tail_len)
+    return hashlib.sha256(f.read(tail_len)).hexdigest() == state["tail_sha"]
+
+def refresh_shards(triage_root, state):
+    """Re-read shards whose size or mtime changed. Returns the number re-read"""
+    root = pathlib.Path(triage_root)
+    cached = state["shards"]
+    seen, reread = set(), 0
+    if root.is_dir():
+        for name in triage_shards.read_index(root):
+            try:
+                st = (root / name).stat()
+            except FileNotFoundError:
+                continue
+            seen.add(name)
+            stamp = [st.st_size, st.st_mtime_ns]
+            if cached.get(name, {}).get("stamp") == stamp:
+                continue
+            rows = {row["id"]: {"note": row["title"], **{f: row[f] for f in ROW_FIELDS}}
+                    for row in triage_shards.iter_rows(root / name)}
+            cached[name] = {"stamp": stamp, "rows": rows}
+            reread += 1
+    for name in set(cached) - seen:
+        del cached[name]
+        reread += 1
+    return reread
+
+def merged_tickets(state):
+    """Log-derived tickets with the shard rows laid over them"""
+    tickets = {key: dict(ticket) for key, ticket in state["tickets"].items()}
+    for name in sorted(state["shards"]):
+        for key, row in state["shards"][name]["rows"].items():
+            ticket = tickets.setdefault(key, {})
+            closed = ticket.get("status") if ticket.get("status") in CLOSED_STATUSES else None
+            ticket.setdefault("note", row["note"])
+            for field in ROW_FIELDS:
+                if row[field]:
+                    ticket[field] = row[field]
+            if closed and ticket["status"] not in CLOSED_STATUSES:
+                ticket["status"] = closed
+    return tickets
+
+def replay(log_path, state):
+    """Replay log lines after the snapshot offset. Returns (state, lines replayed)"""
+    if not log_path.exists():
+        state = dict(empty_state(), shards=state["shards"])
+        return state, 0
+
+    replayed = 0
+    with open(log_path, "rb") as f:
+        if not snapshot_matches(f, state):
+            # Log was rewritten or truncated: rebuild from the start
+            state = dict(empty_state(), shards=state["shards"])
+        f.seek(state["offset"])
+        offset = state["offset"]
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break  # partial line still being written
+            offset += len(raw)
+            state["offset"] = offset
+            state["tail_sha"] = hashlib.sha256(raw).hexdigest()
+            state["tail_len"] = len(raw)
+            replayed += 1
+            line = raw.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(entry, dict):
+                apply_entry(state["tickets"], entry)
+    return state, replayed
+
+def write_snapshot(state_path, state):
+    """Atomically write the snapshot"""
+    tmp = state_path.with_name(state_path.name + ".tmp")
+    tmp.write_text(json.dumps(state, sort_keys=True, separators=(",", ":")) + "\n")
+    os.replace(tmp, state_path)
+
+def current_state(log_path, state_path, triage_root=TRIAGE_ROOT):
+    """Snapshot + tail replay + changed shards, refreshing the snapshot as needed"""
+    state, replayed = replay(log_path, load_snapshot(state_path))
+    reread = refresh_shards(triage_root, state)
+    if replayed >= SNAPSHOT_EVERY or reread:
+        write_snapshot(state_path, state)
+    return state
+
+def format_ticket(key, ticket):
+    fields = " | ".join(f"{f}: {ticket[f]}" for f in TRACKED_FIELDS if f in ticket)
+    return f"{key} | {fields}"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Front desk ticket state")
+    parser.add_argument("--log", type=pathlib.Path, default=LOG_PATH)
+    parser.add_argument("--state", type=pathlib.Path, default=STATE_PATH)
+    parser.add_argument("--triage", type=pathlib.Path, default=TRIAGE_ROOT, help="triage shard directory")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("snapshot", help="rewrite the state snapshot")
+    p_status = sub.add_parser("status", help="show the latest state of one ticket")
+    p_status.add_argument("ticket")
+    p_open = sub.add_parser("open", help="list tickets that are not closed")
+    p_open.add_argument("--priority")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "snapshot":
+        state, replayed = replay(args.log, load_snapshot(args.state))
+        reread = refresh_shards(args.triage, state)
+        write_snapshot(args.state, state)
+        print(f"snapshot: {len(merged_tickets(state))} tickets @ offset {state['offset']} "
+              f"(+{replayed} lines, {reread} shards re-read)")
+        return 0
+
+    tickets = merged_tickets(current_state(args.log, args.state, args.triage))
+
+    if args.cmd == "status":
+        ticket = tickets.get(args.ticket)
+        if ticket is None:
+            print(f"Unknown ticket: {args.ticket}")
+            return 1
+        print(format_ticket(args.ticket, ticket))
+        return 0
+
+    shown = 0
+    for key in sorted(tickets):
+        ticket = tickets[key]
+        if ticket.get("status") in CLOSED_STATUSES:
+            continue
+        if args.priority and ticket.get("priority") != args.priority:
+            continue
+        print(format_ticket(key, ticket))
+        shown += 1
+    print(f"open: {shown}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,9 @@
 #!/usr/bin/env python3
-import sys, re, json, datetime, pathlib, hashlib, os
+import sys, re, json, datetime, pathlib, hashlib, os, fcntl, contextlib
+
+import front_desk_metrics
+import log_schema
+import triage_shards
 
 def canon(obj):
     # exclude the 'hash' field from the digest
@@ -9,44 +13,152 @@ def canon(obj):
 def digest(obj):
     return hashlib.sha256(canon(obj)).hexdigest()
 
-def append_atomic(path, data):
-    """Atomically append to file"""
-    with open(path, "ab") as f:
-        f.write(data + b"\n")
+def seal(entry):
+    """Set entry["hash"] and return the log line, serializing the entry once"""
+    body = canon(entry)
+    entry["hash"] = hashlib.sha256(body).hexdigest()
+    log_schema.check(entry)
+    if min(k for k in entry if k != "hash") > "hash":
+        # "hash" sorts first, so the sorted line is the canonical body with it spliced in
+        return b'{"hash":"' + entry["hash"].encode("ascii") + b'",' + body[1:]
+    return json.dumps(entry, sort_keys=True, separators=(",", ":")).encode("utf-8")
 
-def load_last_hash(log):
-    """Get the most recent hash from the log"""
-    if not log.exists():
+# Chain head is searched backwards in blocks of this size
+TAIL_BLOCK = 1 << 16
+
+@contextlib.contextmanager
+def log_lock(log):
+    """Exclusive flock on the log, held across reading the chain head and appending
+
+    Every chain writer (triage.py, triage_interactive.py) takes it, so two
+    writers can never link to the same prev_hash. Yields the append handle.
+    marriage_protection.sh appends unlocked; its events are outside the chain.
+    verify_log.py --repair-from replaces the file while holding the lock, so
+    a writer that was waiting on the old file reopens the log and locks again.
+    """
+    while True:
+        f = open(log, "ab")
+        fcntl.flock(f, fcntl.LOCK_EX)
+        st = os.fstat(f.fileno())
+        try:
+            current = os.stat(log)
+        except FileNotFoundError:
+            current = None
+        if current and (current.st_dev, current.st_ino) == (st.st_dev, st.st_ino):
+            break
+        fcntl.flock(f, fcntl.LOCK_UN)
+        f.close()
+    try:
+        yield f
+    finally:
+        f.flush()
+        fcntl.flock(f, fcntl.LOCK_UN)
+        f.close()
+
+def _chained_hash(line):
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(entry, dict) or entry.get("module") == "marriage_protection":
+        return None
+    return entry.get("hash")
+
+def chain_head(log, end=None):
+    """Hash of the last chained entry in log[0:end], i.e. the next prev_hash
+
+    Read backwards in blocks; this is the rule verify_log.py checks against,
+    and mirror_log.py uses it to compare a mirror's head with the source.
+    """
+    if not os.path.exists(log):
         return ""
-    
-    # Read backwards through the file to find last triage entry
     with open(log, "rb") as f:
-        # Go to end of file
-        f.seek(0, 2)
-        position = f.tell()
-        line = ""
-        
-        while position >= 0:
-            f.seek(position)
-            next_char = f.read(1)
-            if next_char == b"\n":
-                try:
-                    entry = json.loads(line)
-                    # Skip marriage protection events, find last triage entry
-                    if entry.get("type") == "triage" and "hash" in entry:
-                        return entry["hash"]
-                except:
-                    pass
-                line = ""
-            else:
-                line = next_char.decode("utf-8", errors="ignore") + line
-            position -= 1
-    
-    return ""
+        pos, rest = f.seek(0, 2) if end is None else end, b""
+        while pos > 0:
+            step = min(TAIL_BLOCK, pos)
+            pos -= step
+            f.seek(pos)
+            lines = (f.read(step) + rest).split(b"\n")
+            # the first piece may continue in the previous block
+            rest = lines.pop(0)
+            for line in reversed(lines):
+                head = _chained_hash(line)
+                if head:
+                    return head
+    return _chained_hash(rest) or ""
+
+def seal_chain(log, entries):
+    """Link entries after the chain head and seal them; caller holds log_lock
+
+    Nothing is written, so a rejected entry leaves no trace in the table or
+    the log. Returns the lines to append.
+    """
+    prev_hash = chain_head(log)
+    lines = []
+    for entry in entries:
+        entry["prev_hash"] = prev_hash
+        lines.append(seal(entry) + b"\n")
+        prev_hash = entry["hash"]
+    return lines
+
+def load_max_id(triage):
+    """Highest T-id in the triage table (index lookup when sharded)"""
+    if triage_shards.is_sharded(triage):
+        return triage_shards.max_id(triage)
+    maxid = 0
+    if triage.exists():
+        for line in triage.read_text().splitlines():
+            m = re.match(r"\|\s*(T-(\d{4}))\s*\|", line)
+            if m: maxid = max(maxid, int(m.group(2)))
+    return maxid
+
+def write_rows(triage, new_rows):
+    """Add rows to the triage table: append to the active shard, or rewrite triage.md"""
+    if triage_shards.is_sharded(triage):
+        if new_rows:
+            triage_shards.append_rows(triage, new_rows)
+        return
+    rows = []
+    if triage.exists():
+        rows = [l for l in triage.read_text().splitlines() if l.strip()]
+    if not rows or not rows[0].startswith("| id |"):
+        rows = [triage_shards.HEADER]
+    triage.write_text("\n".join(rows + new_rows) + "\n")
+
+def triage_notes(notes, triage, log, src, tag):
+    """Give each note a T-id, add its table row and chain its log entry
+
+    Everything from reading the max ID to the last append happens under the
+    log lock, so concurrent runs get distinct IDs and a linear chain. All
+    entries are sealed (and validated) before the first row is written.
+    """
+    with log_lock(log) as out:
+        maxid = load_max_id(triage)
+        rows, entries = [], []
+        for note in notes:
+            maxid += 1
+            tid = f"T-{maxid:04d}"
+            rows.append(f"| {tid} | {note} | open |  | {tag} |")
+            ts = datetime.datetime.utcnow().isoformat(timespec="seconds") + "Z"
+            entries.append({
+                "id": tid,
+                "note": note,
+                "status": "open",
+                "src": src,
+                "ts": ts,
+                "type": "triage",
+            })
+        lines = seal_chain(log, entries)
+        write_rows(triage, rows)
+        out.writelines(lines)
+    return entries
 
 def main():
     if len(sys.argv) < 4:
-        print("Usage: triage.py intake.md triage.md log.jsonl [--from-logs]")
+        print("Usage: triage.py intake.md triage_dir|triage.md log.jsonl [--from-logs]")
         return
     
     intake, triage, log = map(pathlib.Path, sys.argv[1:4])
@@ -56,14 +168,7 @@ def main():
         process_from_logs(log, triage)
         return
     
-    # 1) load current max ID
-    maxid = 0
-    if triage.exists():
-        for line in triage.read_text().splitlines():
-            m = re.match(r"\|\s*(T-(\d{4}))\s*\|", line)
-            if m: maxid = max(maxid, int(m.group(2)))
-
-    # 2) read unchecked bullets from intake
+    # 1) read unchecked bullets from intake
     if not intake.exists():
         print(f"No intake file found: {intake}")
         return
@@ -71,50 +176,10 @@ def main():
     raw = intake.read_text().splitlines()
     new_items = [l.strip("- [ ]").strip() for l in raw if l.startswith("- [ ]")]
 
-    # 3) append to triage table if missing
-    rows = []
-    if triage.exists():
-        rows = [l for l in triage.read_text().splitlines() if l.strip()]
-    
-    header = "| id | title | status | due | tag |\n|---|---|---|---|---|"
-    if not rows or not rows[0].startswith("| id |"):
-        rows = [header]
-
-    added = []
-    prev_hash = load_last_hash(log)
-    
-    for note in new_items[:10]:  # cap per run
-        maxid += 1
-        tid = f"T-{maxid:04d}"
-        row = f"| {tid} | {note} | open |  | general |"
-        rows.append(row)
-        
-        # Create entry with hash chain
-        ts = datetime.datetime.utcnow().isoformat(timespec="seconds") + "Z"
-        entry = {
-            "id": tid,
-            "note": note,
-            "status": "open",
-            "src": "intake", 
-            "ts": ts,
-            "type": "triage",
-            "prev_hash": prev_hash,
-        }
-        
-        # Calculate and add hash
-        entry["hash"] = digest(entry)
-        added.append(entry)
-        prev_hash = entry["hash"]
-
-    triage.write_text("\n".join(rows) + "\n")
-
-    # 4) log events with hash chain
-    for entry in added:
-        line_bytes = json.dumps(entry, sort_keys=True, separators=(",", ":")).encode("utf-8")
-        append_atomic(str(log), line_bytes)
-        
-        prev_hash = entry["hash"]
+    # 2) assign IDs, append to triage table and log with hash chain
+    added = triage_notes(new_items[:10], triage, log, "intake", "general")  # cap per run
     
+    front_desk_metrics.record_appended("intake", len(added))
     print(f"triaged: {len(added)}")
 
 def process_from_logs(log, triage):
@@ -123,13 +188,6 @@ def process_from_logs(log, triage):
         print("No log file found")
         return
     
-    # Read existing triage entries to find max ID
-    maxid = 0
-    if triage.exists():
-        for line in triage.read_text().splitlines():
-            m = re.match(r"\|\s*(T-(\d{4}))\s*\|", line)
-            if m: maxid = max(maxid, int(m.group(2)))
-    
     # Extract work sessions from marriage protection logs
     work_sessions = []
     session_start = None
@@ -167,49 +225,10 @@ def process_from_logs(log, triage):
         print("No unassociated work sessions found")
         return
     
-    # Read existing triage rows
-    rows = []
-    if triage.exists():
-        rows = [l for l in triage.read_text().splitlines() if l.strip()]
-    
-    header = "| id | title | status | due | tag |"
-    if not rows or not rows[0].startswith("| id |"):
-        rows = [header, "|---|---|---|---|---|"]
-    
-    added = []
-    prev_hash = load_last_hash(pathlib.Path(log))
-    
-    for session in work_sessions[:5]:  # Limit to avoid spam
-        maxid += 1
-        tid = f"T-{maxid:04d}"
-        note = f"Document work session: {session['note']}"
-        row = f"| {tid} | {note} | open |  | sessions |"
-        rows.append(row)
-        
-        # Create triage entry
-        ts = datetime.datetime.utcnow().isoformat(timespec="seconds") + "Z"
-        entry = {
-            "id": tid,
-            "note": note,
-            "status": "open", 
-            "src": "marriage_logs",
-            "ts": ts,
-            "type": "triage",
-            "prev_hash": prev_hash,
-        }
-        
-        entry["hash"] = digest(entry)
-        added.append(entry)
-        prev_hash = entry["hash"]
-    
-    # Write updated triage table
-    triage.write_text("\n".join(rows) + "\n")
+    notes = [f"Document work session: {session['note']}" for session in work_sessions[:5]]  # Limit to avoid spam
+    added = triage_notes(notes, triage, log, "marriage_logs", "sessions")
     
-    # Append to log with hash chain
-    for entry in added:
-        line_bytes = json.dumps(entry, sort_keys=True, separators=(",", ":")).encode("utf-8")
-        append_atomic(str(log), line_bytes)
-        
+    front_desk_metrics.record_appended("marriage_logs", len(added))
     print(f"Created {len(added)} triage entries from work sessions")
 
 if __name__ == "__main__":
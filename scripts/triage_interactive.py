@@ -5,9 +5,20 @@ Reads untriaged intake.md lines, asks for action/due date
 Still $0 cost, pure Python, no dependencies
 """
 
+import argparse
 import json
 import datetime
 import os
+import sys
+import time
+
+import front_desk_metrics
+import report_cache
+import triage
+import triage_shards
+
+# Bump when the report layout in update_report() changes
+REPORT_TEMPLATE_VERSION = 1
 
 def load_untriaged_items():
     """Load items from intake.md that haven't been processed yet"""
@@ -41,9 +52,8 @@ def load_untriaged_items():
     
     return untriaged
 
-def get_next_note_id():
+def get_next_note_id(log_file='front-desk/log.jsonl'):
     """Get the next available note_id from log.jsonl"""
-    log_file = 'front-desk/log.jsonl'
     if not os.path.exists(log_file):
         return 1
     
@@ -104,7 +114,7 @@ def prompt_for_action(raw_text):
     return action, due, priority
 
 def create_triage_entry(raw_text, note_id, action, due, priority):
-    """Create triage.md line and log.jsonl entry"""
+    """Create triage shard line and log.jsonl entry"""
     timestamp = datetime.datetime.now(datetime.UTC).isoformat().replace('+00:00', 'Z')
     date_str = datetime.datetime.now(datetime.UTC).strftime('%Y-%m-%d')
     
@@ -124,10 +134,40 @@ def create_triage_entry(raw_text, note_id, action, due, priority):
     
     return triage_line, log_entry
 
+def save_entries(items, triage_root='front-desk/triage', log_file='front-desk/log.jsonl'):
+    """Number (raw, action, due, priority) items and write them out
+    
+    note_ids are read from the log and rows appended to the active shard and
+    chained into the log all under the log lock that triage.py takes, so two
+    sessions (or a session and doubt_reset.sh) never hand out the same
+    note_id, fork the chain or race on the shard index. Entries are sealed
+    and validated before either file is touched. Returns the note_ids.
+    """
+    with triage.log_lock(log_file) as out:
+        first = get_next_note_id(log_file)
+        triage_lines, log_entries = [], []
+        for note_id, (raw_text, action, due, priority) in enumerate(items, start=first):
+            triage_line, log_entry = create_triage_entry(raw_text, note_id, action, due, priority)
+            triage_lines.append(triage_line)
+            log_entries.append(log_entry)
+        lines = triage.seal_chain(log_file, log_entries)
+        triage_shards.append_rows(triage_root, triage_lines)
+        out.writelines(lines)
+    return list(range(first, first + len(items)))
+
 def update_report():
     """Update weekly report with current counts"""
     log_file = 'front-desk/log.jsonl'
     report_file = 'reports/week-01.md'
+    started = time.monotonic()
+    
+    # Days Active changes with the date, so the date is part of the key
+    today = datetime.datetime.now(datetime.UTC).strftime('%Y-%m-%d')
+    key = report_cache.input_key(log_file, REPORT_TEMPLATE_VERSION, today)
+    cached = report_cache.lookup(report_file, key)
+    if cached is not None:
+        front_desk_metrics.record_report('report_week01', report_file, started, skipped=True)
+        return cached['total_notes'], cached['triaged_notes'], cached['percent_triaged']
     
     total_notes = 0
     triaged_notes = 0
@@ -188,10 +228,33 @@ Continue adding raw notes to `front-desk/intake.md` and run `python scripts/tria
     with open(report_file, 'w') as f:
         f.write(report_content)
     
+    report_cache.record(report_file, key, {
+        'total_notes': total_notes,
+        'triaged_notes': triaged_notes,
+        'percent_triaged': percent_triaged,
+    })
+    front_desk_metrics.record_report('report_week01', report_file, started, skipped=False)
+    
     return total_notes, triaged_notes, percent_triaged
 
-def main():
+def add_item(raw_text, action, due, priority):
+    """Triage one item without prompting (used by doubt_reset.sh); prints its note_id"""
+    note_id, = save_entries([(raw_text, action, due, priority)])
+    front_desk_metrics.record_appended('interactive', 1)
+    print(note_id)
+
+def main(argv=None):
     """Interactive triage workflow"""
+    parser = argparse.ArgumentParser(description="Interactive triage helper")
+    parser.add_argument("--add", metavar="RAW", help="triage one item without prompting and print its note_id")
+    parser.add_argument("--action", default="follow-up")
+    parser.add_argument("--due", default="48h")
+    parser.add_argument("--priority", default="medium", choices=("urgent", "high", "medium", "low"))
+    args = parser.parse_args(argv)
+    if args.add is not None:
+        add_item(args.add, args.action, args.due, args.priority)
+        return
+
     print("🔄 Interactive Triage Helper")
     print("="*50)
     
@@ -213,21 +276,15 @@ def main():
         print("\n👋 Exiting without changes")
         return
     
-    # Process each item interactively
-    triage_lines = []
-    log_entries = []
-    note_id = get_next_note_id()
+    # Process each item interactively; note_ids are assigned when saving
+    decisions = []
     
     for i, item in enumerate(untriaged_items):
         print(f"\n📍 Item {i+1} of {len(untriaged_items)}")
         
         try:
             action, due, priority = prompt_for_action(item)
-            triage_line, log_entry = create_triage_entry(item, note_id, action, due, priority)
-            
-            triage_lines.append(triage_line)
-            log_entries.append(log_entry)
-            note_id += 1
+            decisions.append((item, action, due, priority))
             
             print(f"✅ Triaged as: {action} (due: {due}, priority: {priority})")
             
@@ -245,35 +302,29 @@ def main():
             print("\n🛑 Interrupted - saving progress so far")
             break
     
-    if not triage_lines:
+    if not decisions:
         print("📝 No items were triaged")
         return
     
     # Save to files
-    print(f"\n💾 Saving {len(triage_lines)} triaged items...")
-    
-    # Append to triage.md
-    with open('front-desk/triage.md', 'a') as f:
-        for line in triage_lines:
-            f.write(line)
+    print(f"\n💾 Saving {len(decisions)} triaged items...")
     
-    # Append to log.jsonl
-    with open('front-desk/log.jsonl', 'a') as f:
-        for entry in log_entries:
-            f.write(json.dumps(entry) + '\n')
+    # Append to the active triage shard and chain into log.jsonl
+    save_entries(decisions)
+    front_desk_metrics.record_appended('interactive', len(decisions))
     
     # Update report
     total, triaged, percent = update_report()
     
-    print(f"✅ Processed {len(triage_lines)} items")
+    print(f"✅ Processed {len(decisions)} items")
     print(f"📊 Total stats: {total} notes, {triaged} triaged ({percent:.1f}%)")
     print(f"📄 Report updated: reports/week-01.md")
     
     # Show items still in intake
-    remaining = len(untriaged_items) - len(triage_lines)
+    remaining = len(untriaged_items) - len(decisions)
     if remaining > 0:
         print(f"📋 {remaining} items remain in intake.md")
         print("Run this script again to continue triaging")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
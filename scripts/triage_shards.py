@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Month-sharded triage tables.
+
+Triage rows live in front-desk/triage/YYYY-MM.md instead of one growing
+triage.md. A small generated index.md records the first/last T-id and row
+count per shard, so finding the next ID reads the index and a daily run only
+appends to the active shard. Writes, diffs and git snapshots cost O(shard)
+rather than O(all tickets).
+
+Usage:
+  triage_shards.py append "LINE" [--root front-desk/triage]
+  triage_shards.py migrate front-desk/triage.md --month 2025-08 [--root ...]
+  triage_shards.py rebuild-index [--root ...]
+  triage_shards.py active [--root ...]
+"""
+
+import argparse
+import datetime
+import os
+import pathlib
+import re
+import sys
+
+ROOT = pathlib.Path("front-desk/triage")
+INDEX_NAME = "index.md"
+HEADER = "| id | title | status | due | tag |\n|---|---|---|---|---|"
+ROW_ID = re.compile(r"\|\s*(T-(\d{4}))\s*\|")
+DATED_LINE = re.compile(r"^(\d{4}-\d{2})-\d{2} \|")
+INDEX_ROW = re.compile(r"^\|\s*(\S+\.md)\s*\|\s*(\S*)\s*\|\s*(\S*)\s*\|\s*(\d+)\s*\|$")
+
+def is_sharded(path):
+    """A directory (or a path without a .md suffix) selects sharded mode"""
+    path = pathlib.Path(path)
+    return path.is_dir() or not path.suffix
+
+def shard_name(when=None):
+    when = when or datetime.datetime.now(datetime.timezone.utc)
+    return f"{when:%Y-%m}.md"
+
+def active_shard(root=ROOT, when=None):
+    return pathlib.Path(root) / shard_name(when)
+
+def _id_num(tid):
+    m = re.match(r"T-(\d{4})$", tid or "")
+    return int(m.group(1)) if m else 0
+
+def _scan_shard(path):
+    """Index entry for one shard file"""
+    entry = {"first": "", "last": "", "rows": 0}
+    for line in path.read_text().splitlines():
+        if not line.strip() or line.startswith("| id |") or line.startswith("|---"):
+            continue
+        entry["rows"] += 1
+        m = ROW_ID.match(line)
+        if m:
+            entry["first"] = entry["first"] or m.group(1)
+            if _id_num(m.group(1)) > _id_num(entry["last"]):
+                entry["last"] = m.group(1)
+    return entry
+
+def iter_rows(path):
+    """Yield the T-NNNN table rows of a shard as dicts of their columns"""
+    for line in pathlib.Path(path).read_text().splitlines():
+        if not ROW_ID.match(line):
+            continue
+        cells = [c.strip() for c in line.strip().strip("|").split("|")]
+        cells += [""] * (5 - len(cells))
+        yield dict(zip(("id", "title", "status", "due", "tag"), cells[:5]))
+
+def rebuild_index(root=ROOT):
+    """Scan every shard; only needed when index.md is missing or stale"""
+    root = pathlib.Path(root)
+    index = {}
+    if root.exists():
+        for path in sorted(root.glob("*.md")):
+            if path.name != INDEX_NAME:
+                index[path.name] = _scan_shard(path)
+    write_index(root, index)
+    return index
+
+def read_index(root=ROOT):
+    root = pathlib.Path(root)
+    index_path = root / INDEX_NAME
+    if not index_path.exists():
+        return rebuild_index(root)
+    index = {}
+    for line in index_path.read_text().splitlines():
+        m = INDEX_ROW.match(line.strip())
+        if m:
+            index[m.group(1)] = {"first": m.group(2), "last": m.group(3), "rows": int(m.group(4))}
+    return index
+
+def write_index(root, index):
+    root = pathlib.Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    lines = [
+        "# Triage Index",
+        "",
+        "Generated by `scripts/triage_shards.py` - do not edit by hand.",
+        "",
+        "| shard | first | last | rows |",
+        "|---|---|---|---|",
+    ]
+    for name in sorted(index):
+        e = index[name]
+        lines.append(f"| {name} | {e['first']} | {e['last']} | {e['rows']} |")
+    tmp = root / f".{INDEX_NAME}.{os.getpid()}.tmp"
+    tmp.write_text("\n".join(lines) + "\n")
+    os.replace(tmp, root / INDEX_NAME)
+
+def max_id(root=ROOT):
+    """Highest T-id across all shards, read from the index"""
+    return max((_id_num(e["last"]) for e in read_index(root).values()), default=0)
+
+def append_rows(root, lines, when=None, shard=None):
+    """Append lines to the active (or given) shard and update the index"""
+    root = pathlib.Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    name = shard or shard_name(when)
+    path = root / name
+    index = read_index(root)
+    entry = index.get(name) or {"first": "", "last": "", "rows": 0}
+    with open(path, "a") as f:
+        if path.stat().st_size == 0:
+            f.write(HEADER + "\n")
+        for line in lines:
+            f.write(line.rstrip("\n") + "\n")
+            entry["rows"] += 1
+            m = ROW_ID.match(line)
+            if m:
+                entry["first"] = entry["first"] or m.group(1)
+                if _id_num(m.group(1)) > _id_num(entry["last"]):
+                    entry["last"] = m.group(1)
+    index[name] = entry
+    write_index(root, index)
+    return path
+
+def migrate(triage_md, root=ROOT, month=None):
+    """Move a single-file triage.md into shards
+
+    Dated lines ("YYYY-MM-DD | note_id=...") go to their own month; table
+    rows carry no date and go to the given month.
+    """
+    month = month or shard_name()[:-3]
+    by_shard = {}
+    for line in pathlib.Path(triage_md).read_text().splitlines():
+        if not line.strip() or line.startswith("| id |") or line.startswith("|---"):
+            continue
+        m = DATED_LINE.match(line)
+        by_shard.setdefault(f"{m.group(1) if m else month}.md", []).append(line)
+    for name, lines in sorted(by_shard.items()):
+        append_rows(root, lines, shard=name)
+    return {name: len(lines) for name, lines in by_shard.items()}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Month-sharded triage tables")
+    parser.add_argument("--root", type=pathlib.Path, default=ROOT)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_append = sub.add_parser("append", help="append a line to the active shard")
+    p_append.add_argument("line")
+    p_migrate = sub.add_parser("migrate", help="split a single-file triage.md into shards")
+    p_migrate.add_argument("triage_md")
+    p_migrate.add_argument("--month", help="YYYY-MM shard for undated table rows")
+    sub.add_parser("rebuild-index", help="rescan every shard and rewrite index.md")
+    sub.add_parser("active", help="print the active shard path")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "append":
+        print(f"appended to {append_rows(args.root, [args.line])}")
+    elif args.cmd == "migrate":
+        for name, count in sorted(migrate(args.triage_md, args.root, args.month).items()):
+            print(f"{name}: {count} rows")
+    elif args.cmd == "rebuild-index":
+        print(f"indexed {len(rebuild_index(args.root))} shards")
+    else:
+        print(active_shard(args.root))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,10 @@
 #!/usr/bin/env python3
-import hashlib, json, sys, os
+import hashlib, json, sys, os, datetime, shutil, stat, time
+
+import front_desk_metrics
+import log_schema
+import log_segment
+import triage
 
 def canon(obj):
     # exclude the 'hash' field from the digest
@@ -9,41 +14,330 @@ def canon(obj):
 def digest(obj):
     return hashlib.sha256(canon(obj)).hexdigest()
 
+def iter_lines(path):
+    """Yield (line number, raw line) from a JSONL log or a binary segment"""
+    with open(path, "rb") as f:
+        if log_segment.is_segment(f):
+            # marriage protection records are skipped without decoding them
+            for i, _, payload in log_segment.iter_records(f, skip=("marriage_protection",)):
+                yield i, payload
+        else:
+            yield from enumerate(f, start=1)
+
 def main(path):
     if not os.path.exists(path):
         print(f"OK 0 entries (no file): {path}")
         return 0
     prev = None
     n = 0
+    for i, raw in iter_lines(path):
+        line = raw.strip()
+        if not line:
+            continue
+        try:
+            entry = json.loads(line)
+        except Exception as e:
+            print(f"ERROR line {i}: not JSON ({e})"); return 1
+        error = log_schema.validate(entry, strict=False)
+        if error:
+            print(f"ERROR line {i}: schema ({error})"); return 1
+        # Skip comment lines
+        if "_comment" in entry:
+            continue
+        # Skip marriage protection events (different format)
+        if entry.get("module") == "marriage_protection":
+            continue
+        if "hash" not in entry or "prev_hash" not in entry:
+            print(f"ERROR line {i}: missing hash/prev_hash"); return 1
+        if entry.get("prev_hash") != (prev or ""):
+            exp = prev or ""
+            print(f"ERROR line {i}: prev_hash mismatch (have {entry.get('prev_hash')}, expected {exp})")
+            return 1
+        h = digest(entry)
+        if entry["hash"] != h:
+            print(f"ERROR line {i}: hash mismatch (have {entry['hash']}, expected {h})")
+            return 1
+        prev = entry["hash"]
+        n += 1
+    print(f"OK {n} entries: chain verified")
+    return 0
+
+# --- fsck mode -------------------------------------------------------------
+
+# One anchor is kept per this many chained entries. It records the anchored
+# line, its byte range, its hash and a SHA-256 of every byte up to the end of
+# that line, so --fast can prove the prefix is unchanged without parsing it.
+ANCHOR_EVERY = 1000
+PREFIX_BLOCK = 1 << 20
+
+def anchors_path(path):
+    return path + ".anchors"
+
+def scan_jsonl(path, offset=0, line_no=1):
+    """Yield (line number, byte offset, raw line) starting at offset"""
     with open(path, "rb") as f:
-        for i, raw in enumerate(f, start=1):
+        f.seek(offset)
+        for raw in f:
+            yield line_no, offset, raw
+            offset += len(raw)
+            line_no += 1
+
+def fsck_scan(path, start=None):
+    """Check every entry in one pass. Returns (entries, problems, anchors)
+
+    Unlike main(), a broken link does not stop the scan: the chain is
+    resynchronised on the entry's own hash so each damaged region is
+    reported once instead of cascading to the end of the file.
+    """
+    with open(path, "rb") as f:
+        segment = log_segment.is_segment(f)
+    if segment:
+        rows = ((i, None, raw) for i, raw in iter_lines(path))
+        start = None
+    elif start:
+        rows = scan_jsonl(path, start["offset"], start["line"])
+    else:
+        rows = scan_jsonl(path)
+
+    prev = start["prev"] if start else ""
+    # anchors are only taken on a full scan of a JSONL log
+    prefix = hashlib.sha256() if not segment and not start else None
+    problems, anchors, n = [], [], 0
+    for i, offset, raw in rows:
+        if prefix:
+            prefix.update(raw)
+        line = raw.strip()
+        if not line:
+            continue
+        try:
+            entry = json.loads(line)
+        except Exception as e:
+            problems.append((i, f"not JSON ({e})", None))
+            continue
+        error = log_schema.validate(entry, strict=False)
+        if error:
+            problems.append((i, f"schema ({error})", None))
+        if not isinstance(entry, dict) or "_comment" in entry:
+            continue
+        if entry.get("module") == "marriage_protection":
+            continue
+        if "hash" not in entry or "prev_hash" not in entry:
+            problems.append((i, "missing hash/prev_hash", None))
+            continue
+        if entry["prev_hash"] != prev:
+            problems.append((i, f"prev_hash mismatch (have {entry['prev_hash']}, expected {prev})", entry["prev_hash"]))
+        h = digest(entry)
+        if entry["hash"] != h:
+            problems.append((i, f"hash mismatch (have {entry['hash']}, expected {h})", None))
+        prev = entry["hash"]
+        n += 1
+        if prefix and not problems and n % ANCHOR_EVERY == 0:
+            anchors.append({"line": i, "offset": offset, "end": offset + len(raw),
+                            "entries": n, "hash": entry["hash"], "prefix": prefix.hexdigest()})
+    return n, problems, anchors
+
+def locate_parents(path, problems):
+    """Second pass, only when links broke: find the lines that own dangling prev_hashes"""
+    wanted = {ref for _, _, ref in problems if ref}
+    found = {}
+    if not wanted:
+        return found
+    for i, raw in iter_lines(path):
+        try:
+            entry = json.loads(raw)
+        except Exception:
+            continue
+        if isinstance(entry, dict) and entry.get("hash") in wanted:
+            found.setdefault(entry["hash"], i)
+    return found
+
+def load_anchors(path):
+    try:
+        with open(anchors_path(path)) as f:
+            return [json.loads(l) for l in f if l.strip()]
+    except (OSError, json.JSONDecodeError):
+        return []
+
+def last_good_anchor(path, anchors):
+    """Last anchor whose whole prefix still hashes to the recorded digest
+
+    The file is hashed forward once, stopping at the first anchor that no
+    longer matches. Any edit, insertion or removal before an anchor changes
+    its prefix digest, so only the unchanged part of a verified log is
+    skipped. Anchors from before prefix digests were recorded are ignored.
+    Returns (anchor or None, bytes hashed).
+    """
+    good, h, pos = None, hashlib.sha256(), 0
+    with open(path, "rb") as f:
+        for anchor in anchors:
+            if "prefix" not in anchor or anchor["end"] < pos:
+                break
+            while pos < anchor["end"]:
+                block = f.read(min(PREFIX_BLOCK, anchor["end"] - pos))
+                if not block:
+                    return good, pos
+                h.update(block)
+                pos += len(block)
+            if h.hexdigest() != anchor["prefix"]:
+                break
+            good = anchor
+    return good, pos
+
+def write_anchors(path, anchors):
+    if not anchors:
+        if os.path.exists(anchors_path(path)):
+            os.remove(anchors_path(path))
+        return
+    tmp = anchors_path(path) + ".tmp"
+    with open(tmp, "w") as f:
+        for a in anchors:
+            f.write(json.dumps(a, sort_keys=True, separators=(",", ":")) + "\n")
+    os.replace(tmp, anchors_path(path))
+
+def regions(problems):
+    """Collapse problem line numbers into 'a-b' ranges"""
+    spans = []
+    for i, _, _ in problems:
+        if spans and i - spans[-1][1] <= 1:
+            spans[-1][1] = i
+        else:
+            spans.append([i, i])
+    return ", ".join(f"{a}" if a == b else f"{a}-{b}" for a, b in spans)
+
+def fsck(path, fast=False, stats=None):
+    stats = {} if stats is None else stats
+    if not os.path.exists(path):
+        print(f"OK 0 entries (no file): {path}")
+        return 0
+    start, skipped = None, 0
+    if fast:
+        anchor, stats["prefix_bytes"] = last_good_anchor(path, load_anchors(path))
+        if anchor:
+            # the anchored line is covered by the digest; rescan what follows it
+            start = {"offset": anchor["end"], "line": anchor["line"] + 1, "prev": anchor["hash"]}
+            stats["start_offset"] = anchor["end"]
+            skipped = anchor["entries"]
+            print(f"fast: lines 1-{anchor['line']} match the prefix digest of the last full fsck")
+        else:
+            print("fast: no anchor matches the current file; scanning from the start")
+    n, problems, anchors = fsck_scan(path, start)
+    stats["entries"] = n
+    parents = locate_parents(path, problems)
+    for i, msg, ref in problems:
+        print(f"ERROR line {i}: {msg}")
+        if ref:
+            if ref in parents:
+                print(f"  fork: parent is line {parents[ref]}, which already has a successor")
+            else:
+                print(f"  parent not found: entries removed or edited before line {i}")
+    if not start:
+        write_anchors(path, anchors)
+    if problems:
+        print(f"FSCK {n} entries, {len(problems)} problems; damaged lines: {regions(problems)}")
+        return 1
+    if skipped:
+        print(f"OK {skipped + n} entries: chain verified (fsck; {n} rescanned after a matching prefix digest)")
+    else:
+        print(f"OK {n} entries: chain verified (fsck)")
+    return 0
+
+# --- repair ----------------------------------------------------------------
+
+def repair(path, from_line, out=None):
+    """Rebuild the chain from from_line onward, sealing the original first
+
+    Entries before from_line are kept byte for byte. From from_line on, each
+    chained entry is relinked to its predecessor and rehashed, unparseable
+    lines are dropped, and a "repair" entry recording the sealed original
+    closes the new chain. The writers' log lock is held from the copy to the
+    final replace, so no append can land in the file being rewritten.
+    """
+    with open(path, "rb") as f:
+        if log_segment.is_segment(f):
+            print(f"ERROR: unpack the segment before repairing it: {path}")
+            return 1
+    with triage.log_lock(path):
+        return _repair_locked(path, from_line, out)
+
+def _repair_locked(path, from_line, out):
+    stamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    sealed = f"{path}.sealed-{stamp}"
+    shutil.copyfile(path, sealed)
+    os.chmod(sealed, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+    with open(sealed, "rb") as f:
+        sealed_sha = hashlib.sha256(f.read()).hexdigest()
+
+    target = out or path
+    tmp = target + ".tmp"
+    prev, rehashed, dropped = "", 0, 0
+    with open(tmp, "wb") as fout:
+        for i, _, raw in scan_jsonl(sealed):
             line = raw.strip()
-            if not line:
-                continue
             try:
-                entry = json.loads(line)
-            except Exception as e:
-                print(f"ERROR line {i}: not JSON ({e})"); return 1
-            # Skip comment lines
-            if "_comment" in entry:
+                entry = json.loads(line) if line else None
+            except Exception:
+                entry = False
+            chained = (isinstance(entry, dict) and "_comment" not in entry
+                       and entry.get("module") != "marriage_protection")
+            if i < from_line:
+                fout.write(raw)
+                if chained and "hash" in entry:
+                    prev = entry["hash"]
                 continue
-            # Skip marriage protection events (different format)
-            if entry.get("module") == "marriage_protection":
+            if entry is False:
+                print(f"dropped line {i}: not JSON")
+                dropped += 1
                 continue
-            if "hash" not in entry or "prev_hash" not in entry:
-                print(f"ERROR line {i}: missing hash/prev_hash"); return 1
-            if entry.get("prev_hash") != (prev or ""):
-                exp = prev or ""
-                print(f"ERROR line {i}: prev_hash mismatch (have {entry.get('prev_hash')}, expected {exp})")
-                return 1
-            h = digest(entry)
-            if entry["hash"] != h:
-                print(f"ERROR line {i}: hash mismatch (have {entry['hash']}, expected {h})")
-                return 1
-            prev = entry["hash"]
-            n += 1
-    print(f"OK {n} entries: chain verified")
+            if chained:
+                entry["prev_hash"] = prev
+                # sealed with the writers' schema check, so a repair can't launder a bad entry
+                try:
+                    raw = triage.seal(entry) + b"\n"
+                except ValueError as e:
+                    print(f"dropped line {i}: {e}")
+                    dropped += 1
+                    continue
+                prev = entry["hash"]
+                rehashed += 1
+            fout.write(raw if raw.endswith(b"\n") else raw + b"\n")
+        note = {
+            "type": "repair",
+            "ts": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z"),
+            "from_line": from_line,
+            "sealed": os.path.basename(sealed),
+            "sealed_sha256": sealed_sha,
+            "rehashed": rehashed,
+            "dropped": dropped,
+            "prev_hash": prev,
+        }
+        try:
+            fout.write(triage.seal(note) + b"\n")
+        except ValueError:
+            os.unlink(tmp)
+            raise
+    os.replace(tmp, target)
+    print(f"repaired from line {from_line}: {rehashed} rehashed, {dropped} dropped; original sealed as {sealed} ({sealed_sha[:12]})")
     return 0
 
 if __name__ == "__main__":
-    sys.exit(main(sys.argv[1] if len(sys.argv) > 1 else "front-desk/log.jsonl"))
\ No newline at end of file
+    import argparse
+    parser = argparse.ArgumentParser(description="Verify the front desk hash chain")
+    parser.add_argument("path", nargs="?", default="front-desk/log.jsonl")
+    parser.add_argument("--fsck", action="store_true", help="report every broken link and hash mismatch")
+    parser.add_argument("--fast", action="store_true", help="with --fsck: resume from the last good anchor")
+    parser.add_argument("--repair-from", type=int, metavar="LINE", help="seal the log and rebuild the chain from LINE")
+    parser.add_argument("--out", help="with --repair-from: write the repaired log here instead of in place")
+    args = parser.parse_args()
+    if args.repair_from is not None:
+        if args.repair_from < 1:
+            parser.error("--repair-from takes a line number of 1 or more")
+        sys.exit(repair(args.path, args.repair_from, args.out))
+    started, stats = time.monotonic(), {}
+    try:
+        status = fsck(args.path, args.fast, stats) if args.fsck else main(args.path)
+    except ValueError as e:
+        # a truncated segment record ends the scan
+        print(f"ERROR {e}")
+        status = 1
+    front_desk_metrics.record_verify(args.path, "fsck" if args.fsck else "verify", started, status, stats)
+    sys.exit(status)
\ No newline at end of file